@@ -1,12 +1,30 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from passlib.context import CryptContext
-from database import get_db_connection
-from config import JWT_SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from database import db_connection
+from config import (
+    JWT_SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_CACHE_SIZE,
+    AUTH_CACHE_TTL_SECONDS,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE_DEPTH
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
@@ -20,6 +38,50 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# bcrypt runs on its own small pool so a login burst can't occupy the
+# shared threadpool that interview routes depend on. Requests beyond the
+# workers plus PASSWORD_HASH_QUEUE_DEPTH waiting are turned away with 503.
+_hash_pool = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_hash_slots = threading.BoundedSemaphore(
+    PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH
+)
+
+
+async def _run_hashing(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_pool, fn, *args)
+    finally:
+        _hash_slots.release()
+
+
+def hashing_slots() -> dict:
+    capacity = PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_DEPTH
+    return {"in_use": capacity - _hash_slots._value, "capacity": capacity}
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+):
+    """Return (valid, new_hash); new_hash is set when BCRYPT_ROUNDS changed."""
+    return await _run_hashing(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 # ---------------- JWT UTILS ----------------
 
 def create_access_token(data: dict):
@@ -29,21 +91,104 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
 
 
+# ---------------- AUTH CACHE ----------------
+# Decoded tokens and user rows, so an authenticated request normally skips
+# both the JWT decode and the users lookup.
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+_token_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)  # token -> user_id
+_user_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)   # user_id -> user
+
+# All a route gets to see of the user; the password hash never leaves login
+_USER_COLUMNS = "id, name, email"
+
+
+def invalidate_user(user_id: int):
+    """Call after updating or deleting a user row."""
+    _user_cache.pop(user_id)
+
+
+def invalidate_token(token: str):
+    _token_cache.pop(token)
+
+
+def clear_auth_cache():
+    _token_cache.clear()
+    _user_cache.clear()
+
+
+def auth_cache_stats() -> dict:
+    return {"tokens": _token_cache.stats(), "users": _user_cache.stats()}
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
+        user_id = _token_cache.get(token)
         if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
+            user_id: int = payload.get("user_id")
+            if user_id is None:
+                raise HTTPException(status_code=401, detail="Invalid token")
 
-        conn = get_db_connection()
-        user = conn.execute(
-            "SELECT * FROM users WHERE id = ?", (user_id,)
-        ).fetchone()
-        conn.close()
+            # Never serve a token from cache past its own expiry; tokens
+            # without one keep the cache's default TTL
+            expires_at = payload.get("exp")
+            ttl = expires_at - time.time() if expires_at is not None else None
+            _token_cache.set(token, user_id, ttl=ttl)
 
+        user = _user_cache.get(user_id)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
+            # Only a cache miss borrows a connection
+            with db_connection() as conn:
+                row = conn.execute(
+                    f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?", (user_id,)
+                ).fetchone()
+
+            if row is None:
+                raise HTTPException(status_code=401, detail="User not found")
+
+            user = dict(row)
+            _user_cache.set(user_id, user)
 
         return user
 
@@ -0,0 +1,140 @@
+"""
+SQLite connection benchmark.
+
+Replays the query pattern of an authenticated /next-question +
+/submit-answer pair against two setups and reports requests per second:
+
+  baseline  a fresh default connection per query site (rollback journal)
+  pooled    database.db_connection(): one tuned pooled connection per request
+
+Usage: python benchmarks/bench_db.py [--threads 16] [--seconds 5]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TMP_DIR = tempfile.mkdtemp(prefix="mockie-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(TMP_DIR, "pooled.db")
+sys.path.insert(0, str(ROOT))
+
+import database  # noqa: E402
+
+BASELINE_DB = os.path.join(TMP_DIR, "baseline.db")
+
+
+def seed(conn):
+    conn.execute(
+        "INSERT INTO users (name, email, password_hash) VALUES ('b', 'b@x.io', 'x')"
+    )
+    conn.execute(
+        "INSERT INTO interviews (user_id, job_title, created_at) "
+        "VALUES (1, 'Python Developer', '2025-01-01')"
+    )
+    conn.commit()
+
+
+def request_baseline():
+    def query(sql, params=(), write=False):
+        conn = sqlite3.connect(BASELINE_DB)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(sql, params).fetchall()
+        if write:
+            conn.commit()
+        conn.close()
+        return rows
+
+    query("SELECT * FROM users WHERE id = ?", (1,))
+    query("SELECT * FROM interviews WHERE id = ? AND user_id = ?", (1, 1))
+    query("SELECT COUNT(*) FROM questions WHERE interview_id = ?", (1,))
+    query(
+        "INSERT INTO questions (interview_id, question, answer, score, feedback) "
+        "VALUES (1, 'q', 'a', 5, 'f')",
+        write=True
+    )
+
+
+def request_pooled():
+    with database.db_connection() as conn:
+        conn.execute("SELECT * FROM users WHERE id = ?", (1,)).fetchall()
+        conn.execute(
+            "SELECT * FROM interviews WHERE id = ? AND user_id = ?", (1, 1)
+        ).fetchall()
+        conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE interview_id = ?", (1,)
+        ).fetchall()
+        conn.execute(
+            "INSERT INTO questions (interview_id, question, answer, score, feedback) "
+            "VALUES (1, 'q', 'a', 5, 'f')"
+        )
+        conn.commit()
+
+
+def run(name, fn, threads, seconds):
+    done = [0]
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        ok = failed = 0
+        while time.perf_counter() < deadline:
+            try:
+                fn()
+                ok += 1
+            except sqlite3.OperationalError:
+                failed += 1
+        with lock:
+            done[0] += ok
+            errors[0] += failed
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    print(
+        f"{name:<9} {done[0] / seconds:>9.0f} req/s"
+        f"   {errors[0]} 'database is locked' errors"
+    )
+    return done[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    database.init_db()
+    with database.db_connection() as conn:
+        seed(conn)
+
+    # Same schema, but left in the stock rollback-journal configuration
+    baseline = sqlite3.connect(BASELINE_DB)
+    pooled = sqlite3.connect(database.DB_PATH)
+    baseline.executescript("".join(
+        row[0] + ";\n" for row in pooled.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%'"
+        )
+    ))
+    baseline.row_factory = sqlite3.Row
+    seed(baseline)
+    baseline.close()
+    pooled.close()
+
+    print(f"{args.threads} threads, {args.seconds}s each, db in {TMP_DIR}")
+    before = run("baseline", request_baseline, args.threads, args.seconds)
+    after = run("pooled", request_pooled, args.threads, args.seconds)
+    print(f"speedup   {after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
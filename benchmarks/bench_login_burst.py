@@ -0,0 +1,114 @@
+"""
+Login burst benchmark.
+
+Measures the latency of an authenticated threadpool route (/my-interviews)
+while a burst of concurrent /login requests is in flight, in two modes:
+
+  shared     bcrypt on the default threadpool (the old behaviour)
+  dedicated  bcrypt on auth's bounded pool with admission control
+
+Runs in-process over ASGI, so it needs httpx (already required by
+FastAPI's TestClient).
+
+Usage: python benchmarks/bench_login_burst.py [--logins 200] [--rounds 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ["DATABASE_PATH"] = os.path.join(
+    tempfile.mkdtemp(prefix="mockie-bench-"), "login.db"
+)
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def probe(client, headers, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/my-interviews", headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def measure(client, headers, logins):
+    idle = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(probe(client, headers, stop, idle))
+    await asyncio.sleep(1)
+    stop.set()
+    await task
+
+    busy = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(probe(client, headers, stop, busy))
+    responses = await asyncio.gather(*[
+        client.post("/login", json={"email": "bench@x.io", "password": "pw"})
+        for _ in range(logins)
+    ])
+    stop.set()
+    await task
+
+    codes = {}
+    for r in responses:
+        codes[r.status_code] = codes.get(r.status_code, 0) + 1
+    return idle, busy, codes
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    import httpx
+    from starlette.concurrency import run_in_threadpool
+    import auth
+    import main as app_module
+    from database import init_db
+
+    init_db()
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        await client.post(
+            "/signup", json={"name": "b", "email": "bench@x.io", "password": "pw"}
+        )
+        token = (await client.post(
+            "/login", json={"email": "bench@x.io", "password": "pw"}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        dedicated = auth._run_hashing
+
+        async def shared(fn, *fn_args):
+            return await run_in_threadpool(fn, *fn_args)
+
+        print(f"{args.logins} concurrent logins, bcrypt rounds {args.rounds}")
+        print(f"{'mode':<10}{'idle p50':>10}{'burst p50':>11}"
+              f"{'burst p95':>11}{'burst max':>11}   login status codes")
+        for name, runner in (("shared", shared), ("dedicated", dedicated)):
+            auth._run_hashing = runner
+            idle, busy, codes = await measure(client, headers, args.logins)
+            print(
+                f"{name:<10}{statistics.median(idle):>8.1f}ms"
+                f"{statistics.median(busy):>9.1f}ms"
+                f"{percentile(busy, 95):>9.1f}ms{max(busy):>9.1f}ms   {codes}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
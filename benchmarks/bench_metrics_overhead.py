@@ -0,0 +1,119 @@
+"""
+Metrics collection overhead.
+
+Times an authenticated, DB-backed route (/my-interviews, seeded with a few
+interviews) with instrumentation off and on (METRICS_ENABLED=0/1), each in
+its own interpreter since the setting is read at import. Also reports the
+cost of a single histogram observation and of rendering /metrics.
+
+Usage: python benchmarks/bench_metrics_overhead.py [--requests 3000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def run(requests):
+    import httpx
+    import main as app_module
+    import metrics
+    from database import db_connection
+
+    await app_module.startup()
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/signup", json={"name": "b", "email": "bench@x.io", "password": "pw"}
+        )
+        token = (await client.post(
+            "/login", json={"email": "bench@x.io", "password": "pw"}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        with db_connection() as conn:
+            conn.executemany(
+                "INSERT INTO interviews (user_id, job_title, created_at) VALUES (1, ?, ?)",
+                [(f"Role {i}", f"2025-01-{i + 1:02d}") for i in range(20)]
+            )
+            conn.commit()
+
+        for _ in range(200):
+            await client.get("/my-interviews", headers=headers)
+
+        samples = []
+        start = time.perf_counter()
+        for _ in range(requests):
+            t = time.perf_counter()
+            await client.get("/my-interviews", headers=headers)
+            samples.append((time.perf_counter() - t) * 1e6)
+        elapsed = time.perf_counter() - start
+
+    n = 100000
+    t = time.perf_counter()
+    for _ in range(n):
+        metrics.DB_QUERY_SECONDS.observe(("SELECT", "bench"), 0.0004)
+    observe_ns = (time.perf_counter() - t) / n * 1e9
+
+    t = time.perf_counter()
+    body = metrics.render()
+    render_ms = (time.perf_counter() - t) * 1000
+
+    await app_module.shutdown()
+    return {
+        "rps": requests / elapsed,
+        "p50_us": statistics.median(samples),
+        "p99_us": sorted(samples)[int(len(samples) * 0.99)],
+        "observe_ns": observe_ns,
+        "render_ms": render_ms,
+        "render_lines": body.count("\n")
+    }
+
+
+def child(enabled, requests):
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_PATH": os.path.join(tempfile.mkdtemp(prefix="mockie-bench-"), "m.db"),
+        "METRICS_ENABLED": "1" if enabled else "0",
+        "LLM_BACKEND": "fake",
+        "BCRYPT_ROUNDS": "4"
+    })
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--requests", str(requests)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(asyncio.run(run(args.requests))))
+        return
+
+    off = child(False, args.requests)
+    on = child(True, args.requests)
+    print(f"/my-interviews x{args.requests}")
+    for name, r in (("metrics off", off), ("metrics on", on)):
+        print(f"{name:<12}{r['rps']:>8.0f} req/s  p50 {r['p50_us']:>6.0f}us"
+              f"  p99 {r['p99_us']:>6.0f}us")
+    print(f"overhead: {(on['p50_us'] - off['p50_us']):.0f}us per request at p50 "
+          f"({(on['p50_us'] / off['p50_us'] - 1) * 100:+.1f}%)")
+    print(f"histogram observe: {on['observe_ns']:.0f}ns; "
+          f"render /metrics: {on['render_ms']:.2f}ms for {on['render_lines']} lines")
+
+
+if __name__ == "__main__":
+    main()
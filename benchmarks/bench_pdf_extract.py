@@ -0,0 +1,109 @@
+"""
+PDF text extraction benchmark.
+
+Builds a corpus from static/functionalsample.pdf (the page repeated into
+1-, 10-, 30- and 100-page documents; add real files with --corpus DIR) and
+times, per document:
+
+  inline    the old in-process loop (text += page.extract_text())
+  serial    pdf_extract with one child process per document
+  parallel  pdf_extract with PDF_EXTRACT_PROCESSES children per document
+
+Both pdf_extract modes stop at --max-pages. Outputs are checked against
+the inline text for the pages they cover.
+
+Usage: python benchmarks/bench_pdf_extract.py [--corpus DIR] [--max-pages 30]
+           [--processes 2] [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PyPDF2 import PdfReader, PdfWriter  # noqa: E402
+
+import pdf_extract  # noqa: E402
+
+SAMPLE = ROOT / "static" / "functionalsample.pdf"
+
+
+def build_corpus(out_dir, extra_dir=None):
+    page = PdfReader(SAMPLE).pages[0]
+    corpus = []
+    for count in (1, 10, 30, 100):
+        writer = PdfWriter()
+        for _ in range(count):
+            writer.add_page(page)
+        path = Path(out_dir) / f"sample-{count}p.pdf"
+        with open(path, "wb") as f:
+            writer.write(f)
+        corpus.append(path)
+    if extra_dir:
+        corpus.extend(sorted(Path(extra_dir).glob("*.pdf")))
+    return corpus
+
+
+def inline(path, max_pages):
+    text = ""
+    for page in PdfReader(path).pages:
+        text += page.extract_text() or ""
+    return text
+
+
+def sandboxed(processes):
+    def run(path, max_pages):
+        pdf_extract.PDF_EXTRACT_PROCESSES = processes
+        return "".join(pdf_extract.extract_pages(path, max_pages))
+    return run
+
+
+def timed(fn, path, max_pages, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(path, max_pages)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="directory of extra PDFs")
+    parser.add_argument("--max-pages", type=int, default=30)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = [("inline", inline), ("serial", sandboxed(1)),
+             ("parallel", sandboxed(args.processes))]
+
+    print(f"backend {pdf_extract.BACKEND}, max {args.max_pages} pages, "
+          f"{pdf_extract.PDF_PAGES_PER_PROCESS} pages per child")
+    print(f"{'document':<24}{'pages':>6}" + "".join(f"{m:>11}" for m, _ in modes) + "  output")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in build_corpus(tmp, args.corpus):
+            pages = len(PdfReader(path).pages)
+            times, outputs = [], []
+            for _, fn in modes:
+                ms, text = timed(fn, path, args.max_pages, args.repeat)
+                times.append(ms)
+                outputs.append(text)
+
+            expected = "".join(
+                page.extract_text() or ""
+                for page in PdfReader(path).pages[:args.max_pages]
+            )
+            ok = all(text == expected for text in outputs[1:])
+            print(f"{path.name[:23]:<24}{pages:>6}"
+                  + "".join(f"{ms:>9.0f}ms" for ms in times)
+                  + f"  {'matches' if ok else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Question prompt budget benchmark.
+
+Generates a full interview's worth of questions for a long resume and job
+description against a stand-in model whose latency grows with prompt size,
+in two modes, and prints interview_engine's prompt stats for each:
+
+  unbudgeted  PROMPT_CONTEXT_TOKENS / PROMPT_HISTORY_TOKENS set sky-high
+  budgeted    the configured defaults (summaries + compressed history)
+
+Each mode runs in its own interpreter since the budget is read at import.
+
+Usage: python benchmarks/bench_prompt_budget.py [--questions 5] [--ms-per-1k 40]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RESUME = " ".join(
+    f"Worked {i} years on Python, Django, PostgreSQL, Kafka and AWS project {i}, "
+    f"leading a team of {i % 7 + 2} engineers and cutting latency by {i}%."
+    for i in range(1, 150)
+)
+JOB_DESCRIPTION = " ".join(
+    f"Responsibility {i}: design, build and operate backend service {i} "
+    "with strong testing, observability and on-call ownership."
+    for i in range(1, 60)
+)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, ms_per_1k):
+        self.ms_per_1k = ms_per_1k
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05 + len(prompt) / 4 / 1000 * self.ms_per_1k / 1000)
+        if prompt.lstrip().startswith("Summarize"):
+            return FakeResponse("Senior Python engineer, Django, PostgreSQL, Kafka, AWS.")
+        return FakeResponse(
+            f"Question {self.calls}: tell me about a time you scaled a "
+            "Python service under heavy load and what you measured?"
+        )
+
+
+async def run(questions, ms_per_1k):
+    import database
+    import interview_engine
+    import prompt_builder
+
+    database.init_db()
+    interview_engine.MODEL = FakeModel(ms_per_1k)
+
+    asked = []
+    for _ in range(questions):
+        question = await interview_engine.generate_question_async(
+            1, "Python Developer", JOB_DESCRIPTION, RESUME, asked
+        )
+        asked.append(question)
+
+    return prompt_builder.prompt_stats()
+
+
+def child(mode, questions, ms_per_1k):
+    env = dict(os.environ)
+    env["DATABASE_PATH"] = os.path.join(
+        tempfile.mkdtemp(prefix="mockie-bench-"), "prompt.db"
+    )
+    if mode == "unbudgeted":
+        env["PROMPT_CONTEXT_TOKENS"] = env["PROMPT_HISTORY_TOKENS"] = "1000000"
+
+    out = subprocess.run(
+        [sys.executable, __file__, "--child",
+         "--questions", str(questions), "--ms-per-1k", str(ms_per_1k)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--ms-per-1k", type=float, default=40,
+                        help="simulated model latency per 1k prompt tokens")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(asyncio.run(run(args.questions, args.ms_per_1k))))
+        return
+
+    for mode in ("unbudgeted", "budgeted"):
+        stats = child(mode, args.questions, args.ms_per_1k)
+        total_tokens = sum(s["prompt_tokens"] for s in stats.values())
+        total_seconds = sum(s["seconds"] for s in stats.values())
+        print(f"{mode:>10}: {total_tokens:>7} prompt tokens, "
+              f"{total_seconds:.2f}s model time")
+        for template, s in stats.items():
+            print(f"{'':>12}{template:<10} calls={s['calls']} "
+                  f"avg_tokens={s['avg_prompt_tokens']} "
+                  f"saved={s['tokens_saved']} avg={s['avg_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
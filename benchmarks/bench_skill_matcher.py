@@ -0,0 +1,124 @@
+"""
+Skill matcher benchmark.
+
+Pads the real taxonomy (data/skills.json) with synthetic skill names up to
+--patterns entries and times, on a ~5 KB resume:
+
+  naive     one word-bounded regex search per pattern (what growing the old
+            keyword list would have meant)
+  compiled  cv_analyzer.SkillMatcher: every pattern in one trie-shaped regex
+
+and checks they agree: the compiled matcher reports the longest match at
+each position, so a naive hit may only be missing if it lies inside one.
+
+Usage: python benchmarks/bench_skill_matcher.py [--patterns 10000 20000]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cv_analyzer import TAXONOMY_PATH, SkillMatcher, _normalize  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "ri", "tem", "zu", "ph", "on", "ax", "qui", "vel",
+             "dra", "sto", "ne", "bix", "mo", "ty", "gra", "fen", "ul", "sy"]
+
+
+def synthetic_names(count, rng):
+    names = set()
+    while len(names) < count:
+        words = [
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        names.add(" ".join(words))
+    return sorted(names)
+
+
+def build_patterns(total, rng):
+    with open(TAXONOMY_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+
+    patterns = {}
+    for skill, entry in data["skills"].items():
+        for alias in entry.get("match") or [skill, *entry.get("aliases", [])]:
+            patterns[alias] = skill
+    for name in synthetic_names(max(0, total - len(patterns)), rng):
+        patterns[name] = name.title()
+    return patterns
+
+
+def build_resume(patterns, rng):
+    filler = ("Delivered projects across teams, improved reliability and "
+              "mentored engineers while owning production services. ").split()
+    aliases = list(patterns)
+    words = []
+    while sum(len(w) + 1 for w in words) < 5000:
+        words.append(rng.choice(aliases) if rng.random() < 0.08 else rng.choice(filler))
+    return " ".join(words)
+
+
+def naive_find(compiled, text):
+    found = {}
+    for skill, regex in compiled:
+        for match in regex.finditer(text):
+            found.setdefault(skill, []).append(match.span())
+    return found
+
+
+def agrees(found, naive_found):
+    spans = [span for spans in found.values() for span in spans]
+    return all(
+        skill in found or any(a <= start and end <= b for a, b in spans)
+        for skill, hits in naive_found.items()
+        for start, end in hits
+    )
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patterns", type=int, nargs="+", default=[10000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'patterns':>9}{'compile':>10}{'compiled':>11}{'naive':>11}{'speedup':>9}  skills")
+    for total in args.patterns:
+        rng = random.Random(total)
+        patterns = build_patterns(total, rng)
+        text = build_resume(patterns, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(patterns)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        compiled_ms, found = timed(lambda: matcher.find(text), 20)
+
+        naive = [
+            (skill, re.compile(
+                r"(?<![\w.+#])" + r"\s+".join(map(re.escape, _normalize(alias).split()))
+                + r"(?![\w+#])", re.IGNORECASE
+            ))
+            for alias, skill in patterns.items()
+        ]
+        naive_ms, naive_found = timed(lambda: naive_find(naive, text), 2)
+
+        ok = agrees(found, naive_found)
+        print(f"{len(patterns):>9}{compile_ms:>8.0f}ms{compiled_ms:>9.2f}ms"
+              f"{naive_ms:>9.1f}ms{naive_ms / compiled_ms:>8.0f}x  "
+              f"{len(found)} ({'agrees with naive' if ok else 'DIFFERS from naive'})")
+
+
+if __name__ == "__main__":
+    main()
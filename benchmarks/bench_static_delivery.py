@@ -0,0 +1,104 @@
+"""
+Page and static asset delivery.
+
+Runs the app with the in-memory page/asset cache off and on
+(ASSET_CACHE_ENABLED=0/1, each in its own interpreter) and reports:
+
+  - page throughput: /dashboard rendered per request vs. served from memory
+  - first visit: bytes on the wire for every page plus the assets it links,
+    with Accept-Encoding: gzip, br
+  - repeat visit: requests a browser still has to make, i.e. pages (sent as
+    conditional requests if they have an ETag) plus assets that aren't
+    marked immutable; and how many of those come back 304
+
+Usage: python benchmarks/bench_static_delivery.py [--requests 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["/", "/login", "/signup", "/dashboard", "/jobs", "/ai-careers",
+         "/cv-optimization", "/recent-interviews", "/profile", "/support", "/billing"]
+LINK = re.compile(r"""(?:src|href)=["'](/?static/[^"']+)["']""")
+
+
+async def run(requests):
+    import httpx
+    import main as app_module
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    headers = {"Accept-Encoding": "gzip, br"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        # Uncompressed, so the client isn't timing its own gunzip
+        for _ in range(requests):
+            await client.get("/dashboard", headers={"Accept-Encoding": "identity"})
+        rps = requests / (time.perf_counter() - start)
+
+        wire = 0
+        cache = {}  # url -> response headers, as a browser would keep them
+        for page in PAGES:
+            response = await client.get(page, headers=headers)
+            wire += int(response.headers.get("content-length", len(response.content)))
+            cache[page] = response.headers
+            for link in set(LINK.findall(response.text)):
+                url = "/" + link.lstrip("/")
+                if url in cache:
+                    continue
+                asset = await client.get(url, headers=headers)
+                if asset.status_code == 200:
+                    wire += int(asset.headers["content-length"])
+                    cache[url] = asset.headers
+
+        repeat = not_modified = 0
+        for url, cached in cache.items():
+            if "immutable" in cached.get("cache-control", ""):
+                continue
+            conditional = dict(headers)
+            if "etag" in cached:
+                conditional["If-None-Match"] = cached["etag"]
+            repeat += 1
+            response = await client.get(url, headers=conditional)
+            not_modified += response.status_code == 304
+
+    return {"rps": rps, "wire": wire, "repeat": repeat, "not_modified": not_modified,
+            "urls": len(cache)}
+
+
+def child(enabled, requests):
+    env = dict(os.environ, ASSET_CACHE_ENABLED="1" if enabled else "0",
+               LLM_BACKEND="fake")
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--requests", str(requests)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(asyncio.run(run(args.requests))))
+        return
+
+    print(f"{'':<10}{'/dashboard':>14}{'first visit':>14}{'repeat visit':>24}")
+    for name, enabled in (("cache off", False), ("cache on", True)):
+        r = child(enabled, args.requests)
+        print(f"{name:<10}{r['rps']:>8.0f} req/s{r['wire'] / 1024:>11.1f} KB"
+              f"{r['repeat']:>6}/{r['urls']} requests, {r['not_modified']} x 304")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Event loop responsiveness check for /cv-optimization/analyze.
+
+Uploads a large generated PDF (static/functionalsample.pdf repeated) and,
+while it is being parsed, keeps hitting the async /me route. Exits non-zero
+if any of those requests is stalled longer than --max-stall-ms, which is
+what happens when parsing runs on the event loop.
+
+Usage: python benchmarks/check_event_loop.py [--pages 400] [--max-stall-ms 500]
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TMP_DIR = tempfile.mkdtemp(prefix="mockie-bench-")
+os.environ["DATABASE_PATH"] = os.path.join(TMP_DIR, "loop.db")
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+
+def build_pdf(pages):
+    from PyPDF2 import PdfReader, PdfWriter
+
+    source = PdfReader("static/functionalsample.pdf")
+    writer = PdfWriter()
+    for i in range(pages):
+        writer.add_page(source.pages[i % len(source.pages)])
+    # Vary the metadata so the upload doesn't hit any content-hash cache
+    writer.add_metadata({"/Subject": str(time.time())})
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--max-stall-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    import httpx
+    import main as app_module
+    import uploads
+    from database import init_db
+    from workers import shutdown_workers
+
+    uploads.RESUMES_DIR = Path(TMP_DIR) / "resumes"
+    init_db()
+    pdf = build_pdf(args.pages)
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        await client.post(
+            "/signup", json={"name": "b", "email": "loop@x.io", "password": "pw"}
+        )
+        token = (await client.post(
+            "/login", json={"email": "loop@x.io", "password": "pw"}
+        )).json()["access_token"]
+
+        # Warm the worker pool so process start-up isn't measured
+        await client.post(
+            "/cv-optimization/analyze",
+            headers={"Authorization": f"Bearer {token}"},
+            files={"resume": ("warm.pdf", build_pdf(1), "application/pdf")},
+        )
+
+        stalls = []
+        start = time.perf_counter()
+        analyze = asyncio.create_task(client.post(
+            "/cv-optimization/analyze",
+            headers={"Authorization": f"Bearer {token}"},
+            files={"resume": ("big.pdf", pdf, "application/pdf")},
+        ))
+        while not analyze.done():
+            sent = time.perf_counter()
+            await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+            stalls.append((time.perf_counter() - sent) * 1000)
+            await asyncio.sleep(0.005)
+        response = await analyze
+        elapsed = (time.perf_counter() - start) * 1000
+
+    shutdown_workers()
+
+    worst = max(stalls) if stalls else float("inf")
+    print(f"analyze: HTTP {response.status_code}, {args.pages} pages, {elapsed:.0f} ms")
+    print(f"/me during parse: {len(stalls)} requests, worst {worst:.1f} ms")
+
+    if response.status_code != 200 or worst > args.max_stall_ms:
+        print(f"FAIL: event loop stalled (limit {args.max_stall_ms:.0f} ms)")
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
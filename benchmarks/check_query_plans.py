@@ -0,0 +1,157 @@
+"""
+Query plan regression check.
+
+Builds a scratch database through database.init_db() and runs EXPLAIN QUERY
+PLAN on the queries each hot route issues. Exits non-zero if any of them
+falls back to a full table scan or a temporary sort.
+
+Usage: python benchmarks/check_query_plans.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.environ["DATABASE_PATH"] = os.path.join(
+    tempfile.mkdtemp(prefix="mockie-plans-"), "plans.db"
+)
+sys.path.insert(0, str(ROOT))
+
+import database  # noqa: E402
+
+# (route, query, params)
+HOT_QUERIES = [
+    ("auth", "SELECT id, name, email FROM users WHERE id = ?", (1,)),
+    ("/login", "SELECT * FROM users WHERE email = ?", ("a@b.c",)),
+    (
+        "/next-question",
+        "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
+        (1, 1),
+    ),
+    (
+        "/next-question resume text",
+        "SELECT text FROM resume_texts WHERE hash = ?",
+        ("h",),
+    ),
+    (
+        "generate_question_async",
+        "SELECT question FROM questions WHERE interview_id = ?",
+        (1,),
+    ),
+    (
+        "take_question",
+        "SELECT 1 FROM questions WHERE interview_id = ? AND question = ?",
+        (1, "q"),
+    ),
+    (
+        "/answer-status",
+        """
+        SELECT q.id, q.status, q.score, q.feedback
+        FROM questions q
+        JOIN interviews i ON i.id = q.interview_id
+        WHERE q.id = ? AND i.user_id = ?
+        """,
+        (1, 1),
+    ),
+    (
+        "/final-feedback, /end-interview",
+        "SELECT answered_count, skipped_count, score_sum FROM interviews WHERE id = ?",
+        (1,),
+    ),
+    (
+        "evaluation_queue idle check",
+        "SELECT 1 FROM questions WHERE status = 'pending' LIMIT 1",
+        (),
+    ),
+    (
+        "evaluation_queue claim",
+        """
+        SELECT id, interview_id, question, answer, attempts
+        FROM questions
+        WHERE status = 'pending'
+        ORDER BY id
+        LIMIT 1
+        """,
+        (),
+    ),
+    (
+        "evaluation_queue lease requeue",
+        """
+        UPDATE questions
+        SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+        WHERE status = 'running'
+          AND (claimed_at IS NULL OR claimed_at < ?)
+        """,
+        (0,),
+    ),
+    (
+        "/my-interviews first page",
+        """
+        SELECT id, job_title, final_score, created_at
+        FROM interviews
+        WHERE user_id = ?
+        AND final_score IS NOT NULL
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (1, 21),
+    ),
+    (
+        "/my-interviews next page",
+        """
+        SELECT id, job_title, final_score, created_at
+        FROM interviews
+        WHERE user_id = ?
+        AND final_score IS NOT NULL
+        AND (created_at, id) < (?, ?)
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (1, "2025-01-01", 1, 21),
+    ),
+    ("/my-stats", "SELECT * FROM user_stats WHERE user_id = ?", (1,)),
+    (
+        "/my-stats trend",
+        """
+        SELECT final_score FROM interviews
+        WHERE user_id = ? AND final_score IS NOT NULL
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+        """,
+        (1, 5),
+    ),
+]
+
+def is_bad_step(step):
+    # A SCAN through an index is fine here (e.g. the partial index of
+    # pending answers); a bare table scan or a temp sort is not
+    if step.startswith("SCAN") and "USING" not in step:
+        return True
+    return "TEMP B-TREE" in step
+
+
+def main():
+    database.init_db()
+    failures = 0
+
+    with database.db_connection() as conn:
+        for route, query, params in HOT_QUERIES:
+            plan = [
+                row["detail"]
+                for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)
+            ]
+            bad = [step for step in plan if is_bad_step(step)]
+            failures += bool(bad)
+
+            print(f"{'FAIL' if bad else 'ok':<5}{route}")
+            for step in plan:
+                print(f"       {step}")
+
+    if failures:
+        print(f"\n{failures} query plan(s) regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
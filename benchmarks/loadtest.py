@@ -0,0 +1,190 @@
+"""
+End-to-end load test.
+
+Drives complete interviews at a fixed concurrency and reports throughput
+and p50/p95/p99 latency per route:
+
+  signup -> login -> start-interview -> (next-question, submit-answer) x5
+         -> final-feedback
+
+By default the app runs in-process over ASGI with the local fake model
+(LLM_BACKEND=fake) and a throwaway database, so the numbers are the app's
+own overhead plus the simulated model latency. With --url it drives an
+already running server instead (start it with LLM_BACKEND=fake for the
+same setup).
+
+Usage: python benchmarks/loadtest.py [--users 20] [--interviews 100]
+           [--latency-ms 800] [--failure-rate 0] [--resume]
+           [--max-p95-ms N] [--url http://localhost:8000]
+
+--max-p95-ms makes the run exit non-zero if any route's p95 is above it.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESUME_PDF = ROOT / "static" / "functionalsample.pdf"
+
+JOB_TITLES = ["Python Developer", "Data Analyst", "DevOps Engineer", "QA Engineer"]
+QUESTIONS_PER_INTERVIEW = 5
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    async def request(self, client, route, method, url, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples.setdefault(route, []).append(
+            (time.perf_counter() - start) * 1000
+        )
+        if response.status_code >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+            response.raise_for_status()
+        return response.json()
+
+
+async def interview(client, rec, n, with_resume):
+    email = f"load-{uuid.uuid4().hex[:12]}@bench.io"
+    await rec.request(client, "signup", "POST", "/signup", json={
+        "name": "Load", "email": email, "password": "pw"
+    })
+    token = (await rec.request(client, "login", "POST", "/login", json={
+        "email": email, "password": "pw"
+    }))["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    files = None
+    if with_resume:
+        files = {"resume": ("cv.pdf", RESUME_PDF.read_bytes(), "application/pdf")}
+    interview_id = (await rec.request(
+        client, "start-interview", "POST", "/start-interview",
+        headers=headers, files=files,
+        data={
+            "job_title": JOB_TITLES[n % len(JOB_TITLES)],
+            "job_description": "Build and run backend services for interview load test"
+        }
+    ))["interview_id"]
+
+    for _ in range(QUESTIONS_PER_INTERVIEW):
+        question = await rec.request(
+            client, "next-question", "GET",
+            f"/next-question?interview_id={interview_id}", headers=headers
+        )
+        if question.get("end"):
+            break
+        await rec.request(client, "submit-answer", "POST", "/submit-answer",
+                          headers=headers, json={
+                              "interview_id": interview_id,
+                              "question": question["question"],
+                              "answer": "I would measure first, then fix the bottleneck."
+                          })
+
+    await rec.request(
+        client, "final-feedback", "GET",
+        f"/final-feedback?interview_id={interview_id}", headers=headers
+    )
+
+
+async def run(client, args):
+    rec = Recorder()
+    counter = itertools.count()
+    failed = 0
+
+    async def user():
+        nonlocal failed
+        while (n := next(counter)) < args.interviews:
+            try:
+                await interview(client, rec, n, args.resume)
+            except Exception:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[user() for _ in range(args.users)])
+    return rec, failed, time.perf_counter() - start
+
+
+def report(rec, failed, elapsed, args):
+    requests = sum(len(s) for s in rec.samples.values())
+    print(f"{args.interviews} interviews, {args.users} concurrent users, "
+          f"{elapsed:.1f}s")
+    print(f"throughput: {args.interviews / elapsed:.2f} interviews/s, "
+          f"{requests / elapsed:.1f} req/s, failed interviews: {failed}")
+    print(f"{'route':<16}{'count':>7}{'errors':>8}"
+          f"{'p50':>10}{'p95':>10}{'p99':>10}")
+
+    slow = []
+    for route, samples in rec.samples.items():
+        p95 = percentile(samples, 95)
+        print(f"{route:<16}{len(samples):>7}{rec.errors.get(route, 0):>8}"
+              f"{percentile(samples, 50):>8.1f}ms{p95:>8.1f}ms"
+              f"{percentile(samples, 99):>8.1f}ms")
+        if args.max_p95_ms and p95 > args.max_p95_ms:
+            slow.append(route)
+
+    if slow:
+        print(f"p95 above {args.max_p95_ms}ms: {', '.join(slow)}")
+    return not slow and not failed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=800,
+                        help="median fake model latency")
+    parser.add_argument("--failure-rate", type=float, default=0)
+    parser.add_argument("--resume", action="store_true",
+                        help="attach a PDF resume to every interview")
+    parser.add_argument("--max-p95-ms", type=float)
+    parser.add_argument("--url", help="drive a running server instead")
+    args = parser.parse_args()
+
+    import httpx
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+            return report(*await run(client, args), args)
+
+    tmp = tempfile.mkdtemp(prefix="mockie-bench-")
+    os.environ.update({
+        "DATABASE_PATH": os.path.join(tmp, "load.db"),
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_LLM_FAILURE_RATE": str(args.failure_rate),
+        "BCRYPT_ROUNDS": os.environ.get("BCRYPT_ROUNDS", "10")
+    })
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+
+    import main as app_module
+    import uploads
+
+    uploads.RESUMES_DIR = Path(tmp) / "resumes"
+    await app_module.startup()
+    try:
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            return report(*await run(client, args), args)
+    finally:
+        await app_module.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -8,3 +8,123 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+
+# Parsed resume texts kept in memory in front of the resume_texts table
+RESUME_TEXT_CACHE_SIZE = int(os.getenv("RESUME_TEXT_CACHE_SIZE", 256))
+
+# Gemini calls: max in flight across all requests, and per-call deadline
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 64))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 30))
+
+# SQLite: file location, pooled connections kept idle, and per-connection PRAGMAs
+DATABASE_PATH = os.getenv("DATABASE_PATH")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 16))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 64 * 1024 * 1024))
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", 8192))
+DB_CACHED_STATEMENTS = int(os.getenv("DB_CACHED_STATEMENTS", 256))
+
+# Decoded JWTs and user rows cached by auth.get_current_user
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 300))
+
+# Password hashing: bcrypt cost, dedicated worker threads, and how many
+# more requests may wait for one before /signup and /login return 503
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", 32))
+
+# Resume uploads are streamed to disk in chunks and rejected past this size
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", 5 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 64 * 1024))
+
+# PDF parsing / resume analysis process pool
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+MAX_CONCURRENT_PARSES = int(os.getenv("MAX_CONCURRENT_PARSES", 8))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", 20))
+
+# Background answer scoring: worker tasks per process, retries, how often
+# idle workers re-check the queue, and how long /final-feedback and
+# /end-interview wait for outstanding scores
+EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", 4))
+EVALUATION_MAX_ATTEMPTS = int(os.getenv("EVALUATION_MAX_ATTEMPTS", 3))
+EVALUATION_POLL_SECONDS = float(os.getenv("EVALUATION_POLL_SECONDS", 1))
+EVALUATION_WAIT_SECONDS = float(os.getenv("EVALUATION_WAIT_SECONDS", 60))
+# A claimed answer whose process stops renewing its lease for this long is
+# handed to another worker
+EVALUATION_LEASE_SECONDS = float(os.getenv("EVALUATION_LEASE_SECONDS", 60))
+
+# Exact-match LLM response cache: in-memory entries, entry lifetime, and
+# the row cap for the llm_cache table
+LLM_CACHE_MEMORY_SIZE = int(os.getenv("LLM_CACHE_MEMORY_SIZE", 1024))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", 100000))
+
+# Question bank: questions kept per job title, whether startup tops the
+# pools up in the background (otherwise run `python question_bank.py`), and
+# how often each process checks the table for new questions (0: never)
+QUESTION_BANK_POOL_SIZE = int(os.getenv("QUESTION_BANK_POOL_SIZE", 30))
+QUESTION_BANK_AUTOSEED = os.getenv("QUESTION_BANK_AUTOSEED", "0") == "1"
+QUESTION_BANK_RELOAD_SECONDS = float(os.getenv("QUESTION_BANK_RELOAD_SECONDS", 60))
+
+# Question prompt budget (estimated tokens): resumes and job descriptions
+# above PROMPT_CONTEXT_TOKENS are summarized once, the asked-questions
+# history is compressed to PROMPT_HISTORY_TOKENS
+PROMPT_CONTEXT_TOKENS = int(os.getenv("PROMPT_CONTEXT_TOKENS", 600))
+PROMPT_HISTORY_TOKENS = int(os.getenv("PROMPT_HISTORY_TOKENS", 300))
+PROMPT_HISTORY_ITEM_WORDS = int(os.getenv("PROMPT_HISTORY_ITEM_WORDS", 15))
+
+# LLM client: per-attempt deadline (LLM_TIMEOUT_SECONDS is the whole call),
+# retries with jittered backoff, hedging after the recent p95 latency, and
+# the circuit breaker (consecutive failures to open, seconds until a probe)
+LLM_ATTEMPT_TIMEOUT_SECONDS = float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", 12))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", 2))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", 0.5))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "0") == "1"
+LLM_HEDGE_MIN_SECONDS = float(os.getenv("LLM_HEDGE_MIN_SECONDS", 1))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30))
+
+# Model backend: "gemini", or "fake" for the local stand-in in fake_llm.py
+# (median latency, log-normal spread, failure rate, RNG seed)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", 800))
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", 0.5))
+FAKE_LLM_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", 0))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", 0))
+
+# Request, model and query timings for /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# Skill taxonomy for CV keyword matching (default: data/skills.json)
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", "")
+
+# Batch CV analysis: files per request and the size cap for a batch request
+# (so for any zip in it); other requests are capped near MAX_RESUME_BYTES
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", 500))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", 200 * 1024 * 1024))
+
+# PDF text extraction (pdf_extract.py): "pypdf2", or "pymupdf" if PyMuPDF
+# is installed; pages read per document, pages per child process, child
+# processes per document, and each document's time and memory limits
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdf2")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 30))
+PDF_PAGES_PER_PROCESS = int(os.getenv("PDF_PAGES_PER_PROCESS", 20))
+PDF_EXTRACT_PROCESSES = int(os.getenv("PDF_EXTRACT_PROCESSES", 2))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", 15))
+PDF_MEMORY_LIMIT_BYTES = int(os.getenv("PDF_MEMORY_LIMIT_BYTES", 512 * 1024 * 1024))
+
+# /my-interviews page size: default and the most a client may ask for
+MY_INTERVIEWS_PAGE_SIZE = int(os.getenv("MY_INTERVIEWS_PAGE_SIZE", 20))
+MY_INTERVIEWS_MAX_PAGE_SIZE = int(os.getenv("MY_INTERVIEWS_MAX_PAGE_SIZE", 100))
+
+# Pages and /static served from memory: pre-rendered, compressed, ETagged,
+# with fingerprinted asset URLs (0 while editing templates or assets)
+ASSET_CACHE_ENABLED = os.getenv("ASSET_CACHE_ENABLED", "1") == "1"
+ASSET_COMPRESS_MIN_BYTES = int(os.getenv("ASSET_COMPRESS_MIN_BYTES", 512))
+
+# Prefetched next questions (interview_engine.py): how long one is kept for
+# an interview that doesn't come back for it, and the most held at once
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", 30 * 60))
+PREFETCH_MAX_ENTRIES = int(os.getenv("PREFETCH_MAX_ENTRIES", 1000))
@@ -1,14 +1,112 @@
-def analyze_resume(text: str):
-    text_lower = text.lower()
+import hashlib
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from resume_parser import extract_text_from_pdf
+from database import db_connection
+from question_bank import normalize_job_title
+from config import SKILL_TAXONOMY_PATH
+
+TAXONOMY_PATH = (
+    Path(SKILL_TAXONOMY_PATH) if SKILL_TAXONOMY_PATH
+    else Path(__file__).resolve().parent / "data" / "skills.json"
+)
+
+# Bump when a scoring change should invalidate stored results
+ANALYZER_VERSION = 1
+
+# ---------------- SKILL MATCHING ----------------
+# Every skill name and alias is compiled into one regex shaped like a trie
+# ("java(?:script)?|..."), so a resume is scanned once however large the
+# taxonomy is. Matches must not touch other word characters; "+", "#" and
+# a leading "." count as part of a word so "c++", "c#" and ".net" work.
+
+
+def _normalize(pattern: str) -> str:
+    return " ".join(pattern.lower().split())
+
+
+def _trie_pattern(words) -> str:
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node) -> str:
+    branches = [
+        # Any run of whitespace (PDF text breaks lines mid-phrase)
+        (r"\s+" if ch == " " else re.escape(ch)) + _node_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch
+    ]
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Greedy optional tail: the longest alias wins ("javascript" over "java")
+    return f"(?:{body})?" if "" in node else body
+
+
+class SkillMatcher:
+    def __init__(self, patterns: dict):
+        """patterns: {alias: canonical skill name}"""
+        self._skills = {_normalize(alias): skill for alias, skill in patterns.items()}
+        self._regex = re.compile(
+            r"(?<![\w.+#])(" + _trie_pattern(self._skills) + r")(?![\w+#])",
+            re.IGNORECASE
+        )
+
+    def find(self, text: str) -> dict:
+        """{skill: [(start, end), ...]} for every occurrence in text."""
+        found = {}
+        for match in self._regex.finditer(text):
+            skill = self._skills.get(_normalize(match.group(1)))
+            if skill:
+                found.setdefault(skill, []).append(match.span(1))
+        return found
+
+
+class SkillTaxonomy:
+    def __init__(self, data: dict):
+        patterns = {}
+        for skill, entry in data["skills"].items():
+            # "match" replaces the name for skills too ambiguous as a word
+            for alias in entry.get("match") or [skill, *entry.get("aliases", [])]:
+                patterns[alias] = skill
+
+        self.matcher = SkillMatcher(patterns)
+        self.roles = data["roles"]
+
+    def role_skills(self, job_title: str = None):
+        return self.roles.get(normalize_job_title(job_title)) or self.roles["default"]
+
+
+@lru_cache(maxsize=1)
+def load_taxonomy() -> SkillTaxonomy:
+    # Compiled once per process, on first use
+    with open(TAXONOMY_PATH, encoding="utf-8") as f:
+        return SkillTaxonomy(json.load(f))
+
+# ---------------- RESUME SCORING ----------------
+
+def analyze_resume(text: str, job_title: str = None):
     word_count = len(text.split())
 
     # ---- ATS SCORE ----
     ats_score = min(90, int(word_count / 5))
 
     # ---- KEYWORD MATCH ----
-    keywords = ["python", "java", "sql", "machine learning", "react", "api"]
-    matched = sum(1 for k in keywords if k in text_lower)
-    keyword_score = int((matched / len(keywords)) * 100)
+    taxonomy = load_taxonomy()
+    found = taxonomy.matcher.find(text)
+    wanted = taxonomy.role_skills(job_title)
+    matched = [skill for skill in wanted if skill in found]
+    keyword_score = int((len(matched) / len(wanted)) * 100)
 
     # ---- FORMATTING ----
     formatting_score = 90 if "\n" in text else 50
@@ -29,5 +127,62 @@ def analyze_resume(text: str):
         "keywords": keyword_score,
         "formatting": formatting_score,
         "clarity": clarity_score,
-        "suggestions": suggestions
+        "suggestions": suggestions,
+        "skills": found,
+        "missing_skills": [skill for skill in wanted if skill not in found]
     }
+
+
+def analyze_resume_file(path, job_title: str = None):
+    # Entry point for the parse worker processes (see workers.py)
+    return analyze_resume(extract_text_from_pdf(path), job_title)
+
+# ---------------- RESULT CACHE ----------------
+# Results are stored per (resume content hash, analyzer version, role).
+# The version includes a digest of the taxonomy file, so editing skills or
+# bumping ANALYZER_VERSION makes old rows miss; prune_analyses() then
+# deletes them.
+
+@lru_cache(maxsize=1)
+def analyzer_version() -> str:
+    digest = hashlib.sha256(TAXONOMY_PATH.read_bytes()).hexdigest()[:12]
+    return f"{ANALYZER_VERSION}:{digest}"
+
+
+def _role_key(job_title: str = None) -> str:
+    return normalize_job_title(job_title) if job_title else ""
+
+
+def load_analysis(resume_hash: str, job_title: str = None):
+    with db_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT result FROM cv_analyses
+            WHERE resume_hash = ? AND version = ? AND role = ?
+            """,
+            (resume_hash, analyzer_version(), _role_key(job_title))
+        ).fetchone()
+    return json.loads(row["result"]) if row else None
+
+
+def save_analysis(resume_hash: str, job_title: str, result: dict):
+    with db_connection() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO cv_analyses
+                (resume_hash, version, role, result, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (resume_hash, analyzer_version(), _role_key(job_title),
+             json.dumps(result), datetime.utcnow().isoformat())
+        )
+        conn.commit()
+
+
+def prune_analyses() -> int:
+    with db_connection() as conn:
+        deleted = conn.execute(
+            "DELETE FROM cv_analyses WHERE version != ?", (analyzer_version(),)
+        ).rowcount
+        conn.commit()
+    return deleted
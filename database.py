@@ -1,20 +1,135 @@
+import queue
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from metrics import DB_QUERY_SECONDS
+from config import (
+    DATABASE_PATH,
+    DB_POOL_SIZE,
+    DB_BUSY_TIMEOUT_MS,
+    DB_SYNCHRONOUS,
+    DB_MMAP_SIZE,
+    DB_CACHE_SIZE_KB,
+    DB_CACHED_STATEMENTS,
+    METRICS_ENABLED
+)
 
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "database.db"
+DB_PATH = Path(DATABASE_PATH) if DATABASE_PATH else BASE_DIR / "database.db"
 
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+# ---------------- QUERY TIMING ----------------
+
+@lru_cache(maxsize=512)
+def _statement_labels(sql: str):
+    operation = sql.split(None, 1)[0].upper() if sql.strip() else ""
+    table = re.search(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+(?:IF NOT EXISTS\s+)?(\w+)", sql, re.IGNORECASE)
+    return operation, table.group(1) if table else ""
+
+
+class _TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            DB_QUERY_SECONDS.observe(_statement_labels(sql), time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            DB_QUERY_SECONDS.observe(_statement_labels(sql), time.perf_counter() - start)
+
+
+class _TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _connect():
+    # check_same_thread=False: a pooled connection is opened in one worker
+    # thread and may be used by the next request on another (never by two
+    # requests at once)
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=DB_CACHED_STATEMENTS,
+        factory=_TimedConnection if METRICS_ENABLED else sqlite3.Connection
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
     return conn
 
 
-def init_db():
-    conn = get_db_connection()
-    cursor = conn.cursor()
+def get_db_connection():
+    """A new tuned connection that the caller must close."""
+    return _connect()
+
+# ---------------- CONNECTION POOL ----------------
+
+_idle = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_in_use = 0
+_in_use_lock = threading.Lock()
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection for the duration of the block."""
+    global _in_use
+    try:
+        conn = _idle.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+
+    with _in_use_lock:
+        _in_use += 1
+    try:
+        yield conn
+    finally:
+        with _in_use_lock:
+            _in_use -= 1
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def pool_stats() -> dict:
+    return {"idle": _idle.qsize(), "in_use": _in_use, "size": DB_POOL_SIZE}
 
+
+def get_db():
+    """FastAPI dependency: one pooled connection shared by the whole request."""
+    with db_connection() as conn:
+        yield conn
+
+
+# ---------------- SCHEMA MIGRATIONS ----------------
+# Applied in order on startup; PRAGMA user_version records how many have
+# run. Append new migrations to the end, never edit one that has shipped.
+# Databases created before versioning have user_version 0, so the early
+# steps must tolerate objects that already exist.
+
+def _migration_1_base_tables(cursor):
     # USERS TABLE
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS users (
@@ -27,19 +142,18 @@ def init_db():
 
     # INTERVIEWS TABLE
     cursor.execute("""
-CREATE TABLE IF NOT EXISTS interviews (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id INTEGER NOT NULL,
-    job_title TEXT,
-    job_description TEXT,
-    resume_path TEXT,
-    final_score INTEGER,
-    final_feedback TEXT,
-    created_at TEXT,
-    FOREIGN KEY (user_id) REFERENCES users (id)
-)
-""")
-
+    CREATE TABLE IF NOT EXISTS interviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        job_title TEXT,
+        job_description TEXT,
+        resume_path TEXT,
+        final_score INTEGER,
+        final_feedback TEXT,
+        created_at TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """)
 
     # QUESTIONS TABLE
     cursor.execute("""
@@ -54,5 +168,299 @@ CREATE TABLE IF NOT EXISTS interviews (
     )
     """)
 
-    conn.commit()
+
+def _migration_2_resume_text_cache(cursor):
+    # PARSED RESUME TEXT (keyed by file content hash)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS resume_texts (
+        hash TEXT PRIMARY KEY,
+        text TEXT NOT NULL
+    )
+    """)
+    _add_column_if_missing(cursor, "interviews", "resume_hash", "TEXT")
+
+
+def _migration_3_hot_path_indexes(cursor):
+    # /next-question, /final-feedback, /end-interview, generate_question
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_questions_interview
+    ON questions (interview_id)
+    """)
+
+    # /my-interviews: WHERE user_id = ? ORDER BY created_at DESC
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_interviews_user_created
+    ON interviews (user_id, created_at)
+    """)
+
+
+def _migration_4_evaluation_queue(cursor):
+    # Answers are scored in the background (see evaluation_queue.py);
+    # rows that existed before were scored inline, so they are 'done'
+    _add_column_if_missing(
+        cursor, "questions", "status", "TEXT NOT NULL DEFAULT 'done'"
+    )
+    _add_column_if_missing(
+        cursor, "questions", "attempts", "INTEGER NOT NULL DEFAULT 0"
+    )
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_questions_pending
+    ON questions (id) WHERE status = 'pending'
+    """)
+
+
+def _migration_5_scoring_mode(cursor):
+    # 'live' scores each answer as it arrives, 'deferred' all at the end
+    _add_column_if_missing(
+        cursor, "interviews", "scoring_mode", "TEXT NOT NULL DEFAULT 'live'"
+    )
+
+
+def _migration_6_llm_cache(cursor):
+    # Exact-match LLM responses (see llm_cache.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used
+    ON llm_cache (last_used)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_llm_cache_created
+    ON llm_cache (created_at)
+    """)
+
+
+def _migration_7_question_bank(cursor):
+    # Pre-generated questions per normalized job title (see question_bank.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS question_bank (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_key TEXT NOT NULL,
+        job_title TEXT NOT NULL,
+        question TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        UNIQUE (job_key, question)
+    )
+    """)
+
+
+def _migration_8_prompt_summaries(cursor):
+    # Resume / job description summaries for question prompts (see prompt_builder.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS prompt_summaries (
+        key TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """)
+
+
+def _migration_9_cv_analyses(cursor):
+    # /cv-optimization results per resume content hash (see cv_analyzer.py)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS cv_analyses (
+        resume_hash TEXT NOT NULL,
+        version TEXT NOT NULL,
+        role TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (resume_hash, version, role)
+    )
+    """)
+
+
+def _migration_10_interview_aggregates(cursor):
+    # Running per-interview totals, kept up to date by triggers on
+    # questions, so routes read them instead of rescanning answers.
+    # Skipped questions count as a score of 0, as they always have.
+    for column in ("question_count", "answered_count", "skipped_count"):
+        _add_column_if_missing(cursor, "interviews", column, "INTEGER NOT NULL DEFAULT 0")
+    _add_column_if_missing(cursor, "interviews", "score_sum", "REAL NOT NULL DEFAULT 0")
+
+    # Skips used to be stored as answer '' with this fixed feedback
+    cursor.execute("""
+    UPDATE questions SET status = 'skipped'
+    WHERE answer = '' AND feedback = 'Question skipped by candidate'
+    """)
+
+    for name, sign, row in (("insert", "+", "NEW"), ("delete", "-", "OLD")):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_{name}_aggregates
+        AFTER {name.upper()} ON questions
+        BEGIN
+            {_aggregate_update(sign, row)}
+        END
+        """)
+
+    # pending -> running -> done only matters once a score lands
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_questions_update_aggregates
+    AFTER UPDATE OF score, status, interview_id ON questions
+    WHEN OLD.score IS NOT NEW.score
+        OR (OLD.status = 'skipped') != (NEW.status = 'skipped')
+        OR OLD.interview_id != NEW.interview_id
+    BEGIN
+        {_aggregate_update("-", "OLD")}
+        {_aggregate_update("+", "NEW")}
+    END
+    """)
+
+    cursor.execute("""
+    UPDATE interviews SET
+        question_count = (
+            SELECT COUNT(*) FROM questions q WHERE q.interview_id = interviews.id
+        ),
+        answered_count = (
+            SELECT COUNT(*) FROM questions q WHERE q.interview_id = interviews.id
+            AND q.score IS NOT NULL AND q.status != 'skipped'
+        ),
+        skipped_count = (
+            SELECT COUNT(*) FROM questions q WHERE q.interview_id = interviews.id
+            AND q.status = 'skipped'
+        ),
+        score_sum = (
+            SELECT COALESCE(SUM(q.score), 0) FROM questions q
+            WHERE q.interview_id = interviews.id
+        )
+    """)
+
+    # Per-user rollup of finished interviews for /my-stats
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id INTEGER PRIMARY KEY,
+        interview_count INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        best_score REAL,
+        last_score REAL,
+        last_finished_at TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """)
+    cursor.execute(_USER_STATS_TRIGGER)
+    cursor.execute("""
+    INSERT OR REPLACE INTO user_stats (
+        user_id, interview_count, score_sum, best_score, last_score, last_finished_at
+    )
+    SELECT
+        user_id,
+        COUNT(*),
+        SUM(final_score),
+        MAX(final_score),
+        (SELECT i2.final_score FROM interviews i2
+         WHERE i2.user_id = i.user_id AND i2.final_score IS NOT NULL
+         ORDER BY i2.created_at DESC, i2.id DESC LIMIT 1),
+        MAX(created_at)
+    FROM interviews i
+    WHERE final_score IS NOT NULL
+    GROUP BY user_id
+    """)
+
+
+def _migration_11_evaluation_leases(cursor):
+    # Which process holds a 'running' answer and when it last renewed the
+    # claim (see evaluation_queue.py); only expired claims are requeued
+    _add_column_if_missing(cursor, "questions", "claimed_by", "TEXT")
+    _add_column_if_missing(cursor, "questions", "claimed_at", "REAL")
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_questions_running
+    ON questions (claimed_at) WHERE status = 'running'
+    """)
+
+
+def _migration_12_user_stats_rescore(cursor):
+    # A lowered final_score used to leave best_score at the old value
+    cursor.execute("DROP TRIGGER IF EXISTS trg_interviews_user_stats")
+    cursor.execute(_USER_STATS_TRIGGER)
+    cursor.execute("""
+    UPDATE user_stats SET best_score = (
+        SELECT MAX(final_score) FROM interviews WHERE user_id = user_stats.user_id
+    )
+    """)
+
+
+# final_score is set by /end-interview and /final-feedback, possibly more
+# than once per interview; only the first one adds to the count, and a
+# re-score recomputes best_score since it may have gone down
+_USER_STATS_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_interviews_user_stats
+AFTER UPDATE OF final_score ON interviews
+WHEN NEW.final_score IS NOT NULL AND OLD.final_score IS NOT NEW.final_score
+BEGIN
+    INSERT OR IGNORE INTO user_stats (user_id) VALUES (NEW.user_id);
+    UPDATE user_stats SET
+        interview_count = interview_count + (OLD.final_score IS NULL),
+        score_sum = score_sum + NEW.final_score - COALESCE(OLD.final_score, 0),
+        best_score = CASE
+            WHEN OLD.final_score IS NULL
+            THEN MAX(COALESCE(best_score, NEW.final_score), NEW.final_score)
+            ELSE (SELECT MAX(final_score) FROM interviews WHERE user_id = NEW.user_id)
+        END,
+        last_score = NEW.final_score,
+        last_finished_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')
+    WHERE user_id = NEW.user_id;
+END
+"""
+
+
+def _aggregate_update(sign, row):
+    return f"""
+        UPDATE interviews SET
+            question_count = question_count {sign} 1,
+            answered_count = answered_count {sign}
+                ({row}.score IS NOT NULL AND {row}.status != 'skipped'),
+            skipped_count = skipped_count {sign} ({row}.status = 'skipped'),
+            score_sum = score_sum {sign} COALESCE({row}.score, 0)
+        WHERE id = {row}.interview_id;
+    """
+
+
+MIGRATIONS = [
+    _migration_1_base_tables,
+    _migration_2_resume_text_cache,
+    _migration_3_hot_path_indexes,
+    _migration_4_evaluation_queue,
+    _migration_5_scoring_mode,
+    _migration_6_llm_cache,
+    _migration_7_question_bank,
+    _migration_8_prompt_summaries,
+    _migration_9_cv_analyses,
+    _migration_10_interview_aggregates,
+    _migration_11_evaluation_leases,
+    _migration_12_user_stats_rescore,
+]
+
+
+def init_db():
+    conn = get_db_connection()
+
+    # WAL is persistent in the database file; readers no longer block writers
+    conn.execute("PRAGMA journal_mode = WAL")
+
+    for version, migration in enumerate(MIGRATIONS, start=1):
+        # IMMEDIATE takes the write lock up front, so when several workers
+        # start together only one of them applies each step
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            if current < version:
+                migration(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.close()
+            raise
+
     conn.close()
+
+
+def _add_column_if_missing(cursor, table, column, decl):
+    columns = [r["name"] for r in cursor.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
@@ -0,0 +1,336 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from database import db_connection
+from interview_engine import (
+    evaluate_answer_async,
+    evaluate_interview_async,
+    parse_evaluation
+)
+from llm_client import CircuitOpenError
+from config import (
+    EVALUATION_WORKERS,
+    EVALUATION_MAX_ATTEMPTS,
+    EVALUATION_POLL_SECONDS,
+    EVALUATION_LEASE_SECONDS,
+    LLM_BREAKER_RESET_SECONDS
+)
+
+# Answers are stored in `questions` with status 'pending' and scored here by
+# background worker tasks, so /submit-answer doesn't wait on Gemini. The
+# table itself is the queue: a restart simply picks pending rows up again.
+#
+#   pending -> running -> done
+#                      -> pending (retry) ... -> failed
+#
+# A 'running' row is leased: claimed_by names the process working on it and
+# claimed_at is renewed while that process is alive. Rows whose lease has
+# lapsed (the process died) go back to 'pending'; rows held by other live
+# processes are left alone.
+#
+# Interviews in deferred scoring mode store answers as 'deferred' instead;
+# score_deferred() grades all of them in a single LLM call at the end.
+
+logger = logging.getLogger(__name__)
+
+# Unique per process, even when a pid is reused after a restart
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_workers = []
+_wakeup = None
+_finished = None
+
+
+def _events():
+    # Created lazily so they bind to the running event loop
+    global _wakeup, _finished
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+        _finished = asyncio.Condition()
+    return _wakeup, _finished
+
+
+def notify_new_job():
+    _events()[0].set()
+
+
+def _claim_job():
+    with db_connection() as conn:
+        # Idle polls only read; the write lock is taken when there's work
+        if not conn.execute(
+            "SELECT 1 FROM questions WHERE status = 'pending' LIMIT 1"
+        ).fetchone():
+            return None
+
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            """
+            SELECT id, interview_id, question, answer, attempts
+            FROM questions
+            WHERE status = 'pending'
+            ORDER BY id
+            LIMIT 1
+            """
+        ).fetchone()
+        if row:
+            conn.execute(
+                """
+                UPDATE questions
+                SET status = 'running', attempts = attempts + 1,
+                    claimed_by = ?, claimed_at = ?
+                WHERE id = ?
+                """,
+                (OWNER, time.time(), row["id"])
+            )
+        conn.commit()
+    return row
+
+
+# Both only touch rows this process still holds: a job whose lease lapsed
+# may already be with another worker
+
+def _finish_job(job_id, status, score=None, feedback=None):
+    with db_connection() as conn:
+        conn.execute(
+            """
+            UPDATE questions
+            SET status = ?, score = ?, feedback = ?, claimed_by = NULL, claimed_at = NULL
+            WHERE id = ? AND claimed_by = ?
+            """,
+            (status, score, feedback, job_id, OWNER)
+        )
+        conn.commit()
+
+
+def _release_job(job_id):
+    # Back to 'pending' without using up one of its attempts
+    with db_connection() as conn:
+        conn.execute(
+            """
+            UPDATE questions
+            SET status = 'pending', attempts = attempts - 1,
+                claimed_by = NULL, claimed_at = NULL
+            WHERE id = ? AND claimed_by = ?
+            """,
+            (job_id, OWNER)
+        )
+        conn.commit()
+
+
+def _renew_leases():
+    """Extend this process's leases and requeue lapsed ones; returns how many."""
+    now = time.time()
+    with db_connection() as conn:
+        conn.execute(
+            """
+            UPDATE questions SET claimed_at = ?
+            WHERE status = 'running' AND claimed_by = ?
+            """,
+            (now, OWNER)
+        )
+        # claimed_at is NULL for rows claimed before leases existed
+        requeued = conn.execute(
+            """
+            UPDATE questions
+            SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+            WHERE status = 'running'
+              AND (claimed_at IS NULL OR claimed_at < ?)
+            """,
+            (now - EVALUATION_LEASE_SECONDS,)
+        ).rowcount
+        conn.commit()
+    return requeued
+
+
+async def _process(job):
+    try:
+        # A retry must not be handed the same cached response again
+        evaluation = await evaluate_answer_async(
+            job["question"], job["answer"], use_cache=job["attempts"] == 0
+        )
+        score, feedback = parse_evaluation(evaluation)
+    except asyncio.CancelledError:
+        # Shutting down: the answer wasn't evaluated, so it keeps its attempt
+        await asyncio.to_thread(_release_job, job["id"])
+        raise
+    except CircuitOpenError:
+        # Not this answer's fault: wait for the model rather than use up attempts
+        await asyncio.sleep(LLM_BREAKER_RESET_SECONDS)
+        await asyncio.to_thread(_release_job, job["id"])
+        notify_new_job()
+        return
+    except Exception:
+        logger.exception("Evaluation of answer %s failed", job["id"])
+        if job["attempts"] + 1 >= EVALUATION_MAX_ATTEMPTS:
+            await asyncio.to_thread(
+                _finish_job, job["id"], "failed", None, "Could not evaluate this answer"
+            )
+        else:
+            # Back off a little before the row becomes claimable again
+            await asyncio.sleep(2 ** job["attempts"])
+            await asyncio.to_thread(_finish_job, job["id"], "pending")
+            notify_new_job()
+        return
+
+    await asyncio.to_thread(_finish_job, job["id"], "done", score, feedback)
+
+
+async def _worker():
+    wakeup, finished = _events()
+    while True:
+        job = await asyncio.to_thread(_claim_job)
+        if job is None:
+            try:
+                await asyncio.wait_for(wakeup.wait(), EVALUATION_POLL_SECONDS)
+            except TimeoutError:
+                pass
+            wakeup.clear()
+            continue
+
+        await _process(job)
+        async with finished:
+            finished.notify_all()
+
+
+async def _lease_keeper():
+    while True:
+        try:
+            if await asyncio.to_thread(_renew_leases):
+                notify_new_job()
+        except Exception:
+            logger.exception("Renewing evaluation leases failed")
+        await asyncio.sleep(EVALUATION_LEASE_SECONDS / 3)
+
+
+def start_workers():
+    # The keeper's first pass requeues rows left by a process that died
+    _workers.append(asyncio.create_task(_lease_keeper()))
+    for _ in range(EVALUATION_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def _claim_deferred(interview_id):
+    with db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            """
+            SELECT id, question, answer FROM questions
+            WHERE interview_id = ? AND status = 'deferred'
+            ORDER BY id
+            """,
+            (interview_id,)
+        ).fetchall()
+        # Claimed like queue jobs, so a concurrent caller waits instead
+        conn.execute(
+            """
+            UPDATE questions SET status = 'running', claimed_by = ?, claimed_at = ?
+            WHERE interview_id = ? AND status = 'deferred'
+            """,
+            (OWNER, time.time(), interview_id)
+        )
+        conn.commit()
+    return rows
+
+
+def _store_results(rows, results):
+    with db_connection() as conn:
+        conn.executemany(
+            """
+            UPDATE questions
+            SET status = 'done', score = ?, feedback = ?, claimed_by = NULL, claimed_at = NULL
+            WHERE id = ? AND claimed_by = ?
+            """,
+            [
+                (score, feedback, r["id"], OWNER)
+                for r, (score, feedback) in zip(rows, results)
+            ]
+        )
+        conn.commit()
+
+
+async def score_deferred(interview_id: int):
+    rows = await asyncio.to_thread(_claim_deferred, interview_id)
+    if not rows:
+        return
+
+    job_ids = [r["id"] for r in rows]
+    try:
+        results = await evaluate_interview_async(
+            [(r["question"], r["answer"]) for r in rows]
+        )
+    except asyncio.CancelledError:
+        await asyncio.to_thread(_set_status, job_ids, "deferred")
+        raise
+    except Exception:
+        # Fall back to scoring them one by one on the regular queue
+        logger.exception("Batch evaluation of interview %s failed", interview_id)
+        await asyncio.to_thread(_set_status, job_ids, "pending")
+        notify_new_job()
+        return
+
+    await asyncio.to_thread(_store_results, rows, results)
+
+    _, finished = _events()
+    async with finished:
+        finished.notify_all()
+
+
+def _set_status(job_ids, status):
+    with db_connection() as conn:
+        conn.executemany(
+            """
+            UPDATE questions SET status = ?, claimed_by = NULL, claimed_at = NULL
+            WHERE id = ? AND claimed_by = ?
+            """,
+            [(status, job_id, OWNER) for job_id in job_ids]
+        )
+        conn.commit()
+
+
+def queue_depth() -> int:
+    with db_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE status = 'pending'"
+        ).fetchone()[0]
+
+
+def outstanding_jobs(interview_id: int) -> int:
+    with db_connection() as conn:
+        return conn.execute(
+            """
+            SELECT COUNT(*) FROM questions
+            WHERE interview_id = ? AND status IN ('pending', 'running')
+            """,
+            (interview_id,)
+        ).fetchone()[0]
+
+
+async def wait_for_interview(interview_id: int, timeout: float):
+    """Wait until every answer of the interview is scored (or timeout)."""
+    _, finished = _events()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while await asyncio.to_thread(outstanding_jobs, interview_id):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        # Also re-check periodically: another process may own the job
+        try:
+            async with finished:
+                await asyncio.wait_for(
+                    finished.wait(), min(remaining, EVALUATION_POLL_SECONDS)
+                )
+        except TimeoutError:
+            pass
+    return True
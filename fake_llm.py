@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from google.api_core import exceptions as google_exceptions
+from config import (
+    FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_LATENCY_SIGMA,
+    FAKE_LLM_FAILURE_RATE,
+    FAKE_LLM_SEED
+)
+
+# Local stand-in for the Gemini model, selected with LLM_BACKEND=fake. It
+# answers every prompt interview_engine sends with plausible, well-formed
+# text after a log-normal delay (median FAKE_LLM_LATENCY_MS), and fails
+# with ServiceUnavailable at FAKE_LLM_FAILURE_RATE. Used for load tests and
+# local development without an API key or quota.
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStream:
+    def __init__(self, chunks, delays):
+        self._chunks = chunks
+        self._delays = delays
+
+    async def __aiter__(self):
+        for chunk, delay in zip(self._chunks, self._delays):
+            await asyncio.sleep(delay)
+            yield FakeResponse(chunk)
+
+
+class FakeModel:
+    def __init__(
+        self,
+        latency_ms: float = FAKE_LLM_LATENCY_MS,
+        sigma: float = FAKE_LLM_LATENCY_SIGMA,
+        failure_rate: float = FAKE_LLM_FAILURE_RATE,
+        seed: int = FAKE_LLM_SEED
+    ):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def _latency(self) -> float:
+        return self.latency_ms / 1000 * self._random.lognormvariate(0, self.sigma)
+
+    def _fails(self) -> bool:
+        return self._random.random() < self.failure_rate
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        latency = self._latency()
+        fails = self._fails()
+
+        if not stream:
+            await asyncio.sleep(latency)
+            if fails:
+                raise google_exceptions.ServiceUnavailable("fake backend failure")
+            return FakeResponse(respond(prompt))
+
+        # First chunk after ~30% of the latency, the rest spread evenly
+        await asyncio.sleep(latency * 0.3)
+        if fails:
+            raise google_exceptions.ServiceUnavailable("fake backend failure")
+        text = respond(prompt)
+        chunks = [text[i:i + 24] for i in range(0, len(text), 24)]
+        delays = [0] + [latency * 0.7 / len(chunks)] * (len(chunks) - 1)
+        return FakeStream(chunks, delays)
+
+
+def respond(prompt: str) -> str:
+    """A well-formed answer to any interview_engine prompt."""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()
+    seed = int(digest[:8], 16)
+
+    if prompt.lstrip().startswith("Summarize"):
+        return "Experienced engineer; Python, SQL, cloud services, team lead on two projects."
+
+    if "JSON array of strings" in prompt:
+        count = int(re.search(r"Write (\d+) different", prompt).group(1))
+        role = _section(prompt, "JOB ROLE")
+        return json.dumps([
+            f"As a {role}, how would you approach problem #{seed % 1000 + i}?"
+            for i in range(count)
+        ])
+
+    if "one object per answer" in prompt:
+        count = len(re.findall(r"^\[\d+\]$", prompt, re.MULTILINE))
+        return json.dumps([
+            {"index": i, "score": (seed + i) % 10 + 1, "feedback": "Reasonable answer."}
+            for i in range(1, count + 1)
+        ])
+
+    if "interview evaluator" in prompt:
+        return json.dumps({
+            "score": seed % 10 + 1,
+            "feedback": "Clear structure; add a concrete example."
+        })
+
+    role = _section(prompt, "JOB ROLE") or "this role"
+    return f"For a {role} position, describe how you would handle scenario {digest[:6]}?"
+
+
+def _section(prompt: str, name: str) -> str:
+    match = re.search(rf"{name}:\n(.*)", prompt)
+    return match.group(1).strip() if match else ""
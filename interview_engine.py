@@ -1,31 +1,282 @@
+import asyncio
+import json
+import re
+import time
 import google.generativeai as genai
-from config import GEMINI_API_KEY
-from database import get_db_connection
+import llm_cache
+import llm_client
+import prompt_builder
+import question_bank
+from config import (
+    GEMINI_API_KEY,
+    LLM_BACKEND,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_ATTEMPT_TIMEOUT_SECONDS,
+    PROMPT_CONTEXT_TOKENS,
+    PREFETCH_TTL_SECONDS,
+    PREFETCH_MAX_ENTRIES
+)
+from database import db_connection
+from metrics import LLM_SECONDS, LLM_TOKENS, LLM_ERRORS
 
 # ================= GEMINI CONFIG =================
 # SAFE + STABLE FOR FREE TIER
 
-genai.configure(api_key=GEMINI_API_KEY)
-MODEL = genai.GenerativeModel("gemini-2.5-flash")
+if LLM_BACKEND == "fake":
+    # Local stand-in for load tests; its own name keeps it out of cached
+    # Gemini responses
+    from fake_llm import FakeModel
+    MODEL_NAME = "fake-local"
+    MODEL = FakeModel()
+elif LLM_BACKEND == "gemini":
+    genai.configure(api_key=GEMINI_API_KEY)
+    MODEL_NAME = "gemini-2.5-flash"
+    MODEL = genai.GenerativeModel(MODEL_NAME)
+else:
+    raise ValueError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
 
-# ================= QUESTION GENERATION =================
+# Part of every llm_cache key: bump when a prompt template changes so
+# responses to the old wording are no longer served
+QUESTION_PROMPT_VERSION = 1
+EVALUATION_PROMPT_VERSION = 2
 
-def generate_question(
-    interview_id: int,
-    job_title: str,
-    job_description: str = "",
-    resume_text: str = ""
+# Caps in-flight Gemini calls across all requests. Created lazily so it
+# binds to the running event loop rather than the import-time one.
+_llm_semaphore = None
+
+
+def _get_llm_semaphore():
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
+# Templates whose prompt asks for JSON; Gemini is told to return only JSON
+_JSON_TEMPLATES = {"evaluation", "batch_evaluation", "question_pool"}
+_JSON_CONFIG = {"response_mime_type": "application/json"}
+
+
+def _generation_config(template):
+    return _JSON_CONFIG if template in _JSON_TEMPLATES else None
+
+
+def llm_slots() -> dict:
+    free = _llm_semaphore._value if _llm_semaphore else LLM_MAX_CONCURRENCY
+    return {"in_use": LLM_MAX_CONCURRENCY - free, "capacity": LLM_MAX_CONCURRENCY}
+
+
+async def _generate_async(
+    prompt: str,
+    generation_config=None,
+    timeout: float = LLM_TIMEOUT_SECONDS,
+    attempt_timeout: float = LLM_ATTEMPT_TIMEOUT_SECONDS
 ):
-    conn = get_db_connection()
-    rows = conn.execute(
-        "SELECT question FROM questions WHERE interview_id = ?",
-        (interview_id,)
-    ).fetchall()
-    conn.close()
+    # Waiting for a slot counts against the attempt's deadline too
+    async def attempt():
+        async with _get_llm_semaphore():
+            response = await MODEL.generate_content_async(
+                prompt, generation_config=generation_config
+            )
+        return response.text.strip()
+
+    return await llm_client.call(attempt, timeout, attempt_timeout)
+
+
+async def _stream_async(
+    prompt: str, generation_config=None, timeout: float = LLM_TIMEOUT_SECONDS
+):
+    """Yield response text chunks as Gemini produces them."""
+    async with _get_llm_semaphore():
+        # Only opening the stream is retried; chunks already sent can't be
+        async def attempt():
+            return await MODEL.generate_content_async(
+                prompt, generation_config=generation_config, stream=True
+            )
+
+        response = await llm_client.call(attempt, timeout, hedge=False)
+        chunks = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+            except StopAsyncIteration:
+                break
+            except llm_client.RETRYABLE:
+                llm_client.breaker.record_failure()
+                raise
+            if chunk.text:
+                yield chunk.text
+
+# ================= RESPONSE CACHE =================
+
+def _cache_key(template, version, inputs):
+    return llm_cache.make_key(MODEL_NAME, template, version, inputs)
+
+
+def _record(template, prompt, raw_tokens, start, response):
+    seconds = time.perf_counter() - start
+    prompt_tokens = prompt_builder.estimate_tokens(prompt)
+    prompt_builder.record_call(
+        template, prompt_tokens, raw_tokens or prompt_tokens, seconds
+    )
+    LLM_SECONDS.observe((template,), seconds)
+    LLM_TOKENS.inc((template, "prompt"), prompt_tokens)
+    LLM_TOKENS.inc((template, "response"), prompt_builder.estimate_tokens(response))
+
+
+def _record_error(template, exc):
+    LLM_ERRORS.inc((template, type(exc).__name__))
+
+
+async def _call_async(template, prompt, raw_tokens=None):
+    start = time.perf_counter()
+    try:
+        text = await _generate_async(prompt, _generation_config(template))
+    except Exception as exc:
+        _record_error(template, exc)
+        raise
+    _record(template, prompt, raw_tokens, start, text)
+    return text
+
+
+async def _call_stream_async(template, prompt, raw_tokens=None):
+    start = time.perf_counter()
+    parts = []
+    try:
+        async for text in _stream_async(prompt, _generation_config(template)):
+            parts.append(text)
+            yield text
+    except Exception as exc:
+        _record_error(template, exc)
+        raise
+    _record(template, prompt, raw_tokens, start, "".join(parts))
+
+
+# Only responses that pass the caller's validate() (which raises ValueError
+# on unusable output) are cached, so a malformed answer from the model is
+# asked for again rather than served from the cache
+
+def _usable(text, validate):
+    if validate is None:
+        return True
+    try:
+        validate(text)
+    except ValueError:
+        return False
+    return True
+
+
+async def _cached_generate_async(
+    template, version, inputs, prompt, use_cache=True, raw_tokens=None, validate=None
+):
+    if not use_cache:
+        llm_cache.record_bypass()
+        return await _call_async(template, prompt, raw_tokens)
+
+    key = _cache_key(template, version, inputs)
+    text = await asyncio.to_thread(llm_cache.get, key)
+    if text is None:
+        text = await _call_async(template, prompt, raw_tokens)
+        if _usable(text, validate):
+            await asyncio.to_thread(llm_cache.put, key, text)
+    return text
+
+
+async def _cached_stream_async(
+    template, version, inputs, prompt, use_cache=True, raw_tokens=None, validate=None
+):
+    if not use_cache:
+        llm_cache.record_bypass()
+        async for text in _call_stream_async(template, prompt, raw_tokens):
+            yield text
+        return
+
+    key = _cache_key(template, version, inputs)
+    cached = await asyncio.to_thread(llm_cache.get, key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async for text in _call_stream_async(template, prompt, raw_tokens):
+        parts.append(text)
+        yield text
+    text = "".join(parts).strip()
+    if _usable(text, validate):
+        await asyncio.to_thread(llm_cache.put, key, text)
+
+# ================= PROMPT BUDGET =================
+# Long resumes / job descriptions are summarized once and the summary reused
+# for every question of the interview (see prompt_builder.py)
 
-    asked_questions = [r["question"] for r in rows]
+_summarizing = {}  # summary key -> Task, so concurrent callers share one call
 
-    prompt = f"""
+
+def _summary_prompt(kind: str, text: str):
+    words = PROMPT_CONTEXT_TOKENS * 3 // 4
+    return f"""
+Summarize this {kind} for a technical interviewer.
+
+{kind.upper()}:
+{text}
+
+RULES:
+- At most {words} words
+- Keep skills, technologies, roles, years of experience and projects
+- Plain text, no commentary
+
+SUMMARY:
+"""
+
+
+async def _summarized_async(kind: str, text: str):
+    if not prompt_builder.over_budget(text):
+        return text
+
+    key = prompt_builder.summary_key(kind, text)
+    summary = await asyncio.to_thread(prompt_builder.load_summary, key)
+    if summary is not None:
+        return summary
+
+    task = _summarizing.get(key)
+    if task is None:
+        task = asyncio.create_task(_summarize_async(key, kind, text))
+        _summarizing[key] = task
+        task.add_done_callback(lambda _: _summarizing.pop(key, None))
+
+    try:
+        # Shielded: one cancelled request must not cancel the others' summary
+        return await asyncio.shield(task)
+    except Exception:
+        return prompt_builder.truncate_tokens(text, PROMPT_CONTEXT_TOKENS)
+
+
+async def _summarize_async(key, kind, text):
+    summary = await _call_async("summary", _summary_prompt(kind, text))
+    return await asyncio.to_thread(_store_summary, key, summary)
+
+
+def _store_summary(key, summary):
+    summary = prompt_builder.truncate_tokens(summary, PROMPT_CONTEXT_TOKENS)
+    prompt_builder.save_summary(key, summary)
+    return summary
+
+# ================= QUESTION GENERATION =================
+
+def _asked_questions(interview_id: int, extra_asked=()):
+    with db_connection() as conn:
+        rows = conn.execute(
+            "SELECT question FROM questions WHERE interview_id = ?",
+            (interview_id,)
+        ).fetchall()
+
+    # extra_asked: served but not yet answered, so not in the table yet
+    return [r["question"] for r in rows] + list(extra_asked)
+
+
+def _question_prompt(job_title, job_description, resume_text, asked_questions):
+    return f"""
 You are a senior technical interviewer.
 
 JOB ROLE:
@@ -50,13 +301,262 @@ RULES:
 QUESTION:
 """
 
-    response = MODEL.generate_content(prompt)
-    return response.text.strip()
+
+def _check_question(text: str):
+    if not text.strip():
+        raise ValueError("Empty question")
+
+
+def _question_inputs(interview_id, job_title, job_description, resume_text, extra_asked=()):
+    return {
+        "job_title": job_title,
+        "job_description": job_description,
+        "resume_text": resume_text,
+        "asked_questions": _asked_questions(interview_id, extra_asked)
+    }
+
+
+def _from_bank(inputs):
+    # Only title-only interviews: anything more specific needs the model
+    context = (inputs["job_description"] or "") + (inputs["resume_text"] or "")
+    if context.strip():
+        return None
+    return question_bank.pick_question(inputs["job_title"], inputs["asked_questions"])
+
+
+def _raw_tokens(inputs):
+    # Size of the prompt had nothing been summarized or compressed
+    return prompt_builder.estimate_tokens(_question_prompt(**inputs))
+
+
+def _budgeted(inputs, job_description, resume_text):
+    return {
+        **inputs,
+        "job_description": job_description,
+        "resume_text": resume_text,
+        "asked_questions": prompt_builder.compress_history(inputs["asked_questions"])
+    }
+
+
+async def _budgeted_inputs_async(inputs):
+    job_description, resume_text = await asyncio.gather(
+        _summarized_async("job description", inputs["job_description"]),
+        _summarized_async("resume", inputs["resume_text"])
+    )
+    return _budgeted(inputs, job_description, resume_text)
+
+
+# Model unavailable: serve a bank question rather than fail the request
+_DEGRADABLE = (llm_client.CircuitOpenError,) + llm_client.RETRYABLE
+
+
+def _fallback_question(inputs):
+    return question_bank.fallback_question(
+        inputs["job_title"], inputs["asked_questions"]
+    )
+
+
+async def generate_question_async(
+    interview_id: int,
+    job_title: str,
+    job_description: str = "",
+    resume_text: str = "",
+    extra_asked=(),
+    use_cache: bool = True
+):
+    inputs = await asyncio.to_thread(
+        _question_inputs,
+        interview_id, job_title, job_description, resume_text, extra_asked
+    )
+    banked = _from_bank(inputs)
+    if banked:
+        return banked
+
+    prompt_inputs = await _budgeted_inputs_async(inputs)
+    try:
+        return await _cached_generate_async(
+            "question", QUESTION_PROMPT_VERSION, prompt_inputs,
+            _question_prompt(**prompt_inputs), use_cache, _raw_tokens(inputs),
+            _check_question
+        )
+    except _DEGRADABLE:
+        question = _fallback_question(inputs)
+        if question is None:
+            raise
+        return question
+
+
+async def stream_question(
+    interview_id: int,
+    job_title: str,
+    job_description: str = "",
+    resume_text: str = "",
+    use_cache: bool = True
+):
+    inputs = await asyncio.to_thread(
+        _question_inputs, interview_id, job_title, job_description, resume_text
+    )
+    banked = _from_bank(inputs)
+    if banked:
+        yield banked
+        return
+
+    prompt_inputs = await _budgeted_inputs_async(inputs)
+    streamed = False
+    try:
+        async for text in _cached_stream_async(
+            "question", QUESTION_PROMPT_VERSION, prompt_inputs,
+            _question_prompt(**prompt_inputs), use_cache, _raw_tokens(inputs),
+            _check_question
+        ):
+            streamed = True
+            yield text
+    except _DEGRADABLE:
+        # Half a question can't be swapped for another one
+        question = None if streamed else _fallback_question(inputs)
+        if question is None:
+            raise
+        yield question
+
+
+def _question_pool_prompt(job_title: str, count: int):
+    return f"""
+You are a senior technical interviewer.
+
+JOB ROLE:
+{job_title}
+
+RULES:
+- Write {count} different interview questions for this role
+- Mix fundamentals, practical experience and problem solving
+- Do NOT give answers
+- Keep it professional
+
+FORMAT:
+Return ONLY a JSON array of strings.
+"""
+
+
+async def generate_question_pool_async(job_title: str, count: int):
+    """Questions for the offline question bank (see question_bank.py)."""
+    text = await _generate_async(
+        _question_pool_prompt(job_title, count),
+        _generation_config("question_pool"),
+        timeout=LLM_TIMEOUT_SECONDS * 4,
+        attempt_timeout=LLM_TIMEOUT_SECONDS * 2
+    )
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON array in question pool")
+    return [str(q).strip() for q in json.loads(match.group(0)) if str(q).strip()]
+
+# ================= QUESTION PREFETCH =================
+# While the candidate answers question N, question N+1 is generated in the
+# background so /next-question can usually return without an LLM round-trip.
+# Abandoned interviews never take theirs, so entries expire after
+# PREFETCH_TTL_SECONDS and the oldest go first beyond PREFETCH_MAX_ENTRIES.
+
+_prefetched = {}  # interview_id -> (pending_question, Task, created_at), oldest first
+
+
+def _drop_prefetched(interview_id):
+    entry = _prefetched.pop(interview_id, None)
+    if entry:
+        entry[1].cancel()
+
+
+def _prune_prefetched():
+    cutoff = time.monotonic() - PREFETCH_TTL_SECONDS
+    for interview_id, (_, _, created_at) in list(_prefetched.items()):
+        if created_at >= cutoff and len(_prefetched) < PREFETCH_MAX_ENTRIES:
+            break
+        _drop_prefetched(interview_id)
+
+
+def prefetch_question(
+    interview_id: int,
+    job_title: str,
+    job_description: str = "",
+    resume_text: str = "",
+    pending_question: str = None
+):
+    _prune_prefetched()
+    if interview_id in _prefetched:
+        return
+
+    extra_asked = [pending_question] if pending_question else []
+    task = asyncio.create_task(
+        generate_question_async(
+            interview_id,
+            job_title,
+            job_description,
+            resume_text,
+            extra_asked
+        )
+    )
+    _prefetched[interview_id] = (pending_question, task, time.monotonic())
+
+
+async def take_question(
+    interview_id: int,
+    job_title: str,
+    job_description: str = "",
+    resume_text: str = ""
+):
+    """Return the prefetched question (waiting if in flight) or generate one."""
+    entry = _prefetched.pop(interview_id, None)
+    if entry and entry[2] < time.monotonic() - PREFETCH_TTL_SECONDS:
+        entry[1].cancel()
+        entry = None
+
+    if entry:
+        pending_question, task, _ = entry
+        try:
+            question = await task
+        except Exception:
+            question = None
+
+        if (
+            question
+            and question != pending_question
+            and not await asyncio.to_thread(_already_asked, interview_id, question)
+        ):
+            return question
+
+    # After a rejected prefetch, ask the model again rather than the cache
+    return await generate_question_async(
+        interview_id=interview_id,
+        job_title=job_title,
+        job_description=job_description,
+        resume_text=resume_text,
+        use_cache=entry is None
+    )
+
+
+def prefetch_count() -> int:
+    return len(_prefetched)
+
+
+def has_prefetch(interview_id: int) -> bool:
+    return interview_id in _prefetched
+
+
+def discard_prefetch(interview_id: int):
+    _drop_prefetched(interview_id)
+
+
+def _already_asked(interview_id: int, question: str) -> bool:
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM questions WHERE interview_id = ? AND question = ?",
+            (interview_id, question)
+        ).fetchone()
+    return row is not None
 
 # ================= ANSWER EVALUATION =================
 
-def evaluate_answer(question: str, answer: str):
-    prompt = f"""
+def _evaluation_prompt(question: str, answer: str):
+    return f"""
 You are an interview evaluator.
 
 QUESTION:
@@ -71,9 +571,142 @@ RULES:
 - Do NOT rewrite answer
 
 FORMAT:
-Score: X
-Feedback: <text>
+Return ONLY a JSON object:
+{{"score": X, "feedback": "<text>"}}
+"""
+
+
+def _score(value) -> int:
+    return min(10, max(1, int(round(float(value)))))
+
+
+def parse_evaluation(text: str):
+    """(score, feedback) from the JSON evaluation; ValueError if unusable."""
+    # Models sometimes wrap JSON in a ``` fence, or ignore the format
+    # altogether and answer with "Score: X / Feedback: ..." lines
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            return _score(data["score"]), str(data["feedback"]).strip()
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    score = re.search(r"score\W*(\d+(?:\.\d+)?)", text, re.IGNORECASE)
+    feedback = re.search(r"feedback\W*(.+)", text, re.IGNORECASE | re.DOTALL)
+    if not score or not feedback:
+        raise ValueError("Could not parse evaluation")
+    return _score(score.group(1)), feedback.group(1).strip()
+
+
+class FeedbackStream:
+    """Decoded text of the "feedback" string of a JSON evaluation, fed the
+    raw response chunk by chunk as it streams in."""
+
+    _START = re.compile(r'"feedback"\s*:\s*"')
+
+    def __init__(self):
+        self._raw = ""
+        self._pos = None  # just past the last decoded character
+        self._closed = False
+
+    def feed(self, chunk: str) -> str:
+        """Feedback text completed by this chunk ("" if none yet)."""
+        self._raw += chunk
+        if self._closed:
+            return ""
+        if self._pos is None:
+            match = self._START.search(self._raw)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        raw, i, text = self._raw, self._pos, []
+        while i < len(raw):
+            char = raw[i]
+            if char == '"':
+                self._closed = True
+                break
+            if char != "\\":
+                text.append(char)
+                i += 1
+                continue
+            # Escapes are decoded only once complete; \ud83d\ude00 pairs whole
+            width = 2
+            if raw[i + 1:i + 2] == "u":
+                width = 12 if "d800" <= raw[i + 2:i + 6].lower() <= "dbff" else 6
+            if i + width > len(raw):
+                break
+            try:
+                text.append(json.loads(f'"{raw[i:i + width]}"'))
+            except ValueError:
+                pass  # Malformed escape; the final parse reports the text
+            i += width
+
+        self._pos = i
+        return "".join(text)
+
+
+async def evaluate_answer_async(question: str, answer: str, use_cache: bool = True):
+    return await _cached_generate_async(
+        "evaluation", EVALUATION_PROMPT_VERSION,
+        {"question": question, "answer": answer},
+        _evaluation_prompt(question, answer), use_cache,
+        validate=parse_evaluation
+    )
+
+
+def stream_evaluation(question: str, answer: str, use_cache: bool = True):
+    return _cached_stream_async(
+        "evaluation", EVALUATION_PROMPT_VERSION,
+        {"question": question, "answer": answer},
+        _evaluation_prompt(question, answer), use_cache,
+        validate=parse_evaluation
+    )
+
+
+# ================= BATCH EVALUATION =================
+# Deferred-scoring interviews send every answer in one request at the end
+
+def _batch_evaluation_prompt(pairs):
+    answers = "\n\n".join(
+        f"[{i}]\nQUESTION:\n{question}\nANSWER:\n{answer}"
+        for i, (question, answer) in enumerate(pairs, start=1)
+    )
+    return f"""
+You are an interview evaluator.
+
+{answers}
+
+RULES:
+- Evaluate every answer independently
+- Score each from 1 to 10
+- Short feedback for each
+- Do NOT rewrite answers
+
+FORMAT:
+Return ONLY a JSON array with one object per answer, in order:
+[{{"index": 1, "score": X, "feedback": "<text>"}}]
 """
 
-    response = MODEL.generate_content(prompt)
-    return response.text.strip()
+
+def parse_batch_evaluation(text: str, expected: int):
+    # Models sometimes wrap JSON in a ``` fence
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON array in batch evaluation")
+
+    items = {int(item["index"]): item for item in json.loads(match.group(0))}
+    if set(items) != set(range(1, expected + 1)):
+        raise ValueError("Batch evaluation does not cover every answer")
+
+    return [
+        (_score(items[i]["score"]), str(items[i]["feedback"]).strip())
+        for i in range(1, expected + 1)
+    ]
+
+
+async def evaluate_interview_async(pairs):
+    """Score [(question, answer), ...] in one call; returns [(score, feedback)]."""
+    text = await _call_async("batch_evaluation", _batch_evaluation_prompt(pairs))
+    return parse_batch_evaluation(text, len(pairs))
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from database import db_connection
+from config import LLM_CACHE_MEMORY_SIZE, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ROWS
+
+# Exact-match cache of LLM responses: an in-memory LRU in front of the
+# llm_cache table. Keys hash the model, the prompt template and its version,
+# and whitespace/case-normalized inputs, so bumping a template version
+# stops old responses from being served.
+
+_memory = OrderedDict()  # key -> (expires_at, response)
+_lock = threading.Lock()
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "bypassed": 0}
+
+# Trim the table every so many writes rather than on each one
+_EVICT_EVERY = 100
+_writes = 0
+
+# Hits only note their key here; last_used is written for a batch of them
+# at once instead of an UPDATE and commit per hit
+_FLUSH_TOUCHED_EVERY = 100
+_touched = {}  # key -> last hit time
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(model: str, template: str, version: int, inputs: dict) -> str:
+    payload = json.dumps(
+        [model, template, version, _normalize(inputs)],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get(key: str):
+    now = time.time()
+
+    with _lock:
+        entry = _memory.get(key)
+        if entry and entry[0] > now:
+            _memory.move_to_end(key)
+            _stats["memory_hits"] += 1
+            _touched[key] = now
+            return entry[1]
+
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row and row["created_at"] + LLM_CACHE_TTL_SECONDS > now:
+            _remember(key, row["response"], row["created_at"])
+            _stats["db_hits"] += 1
+            with _lock:
+                _touched[key] = now
+            if len(_touched) >= _FLUSH_TOUCHED_EVERY:
+                _flush_touched(conn)
+            return row["response"]
+
+    _stats["misses"] += 1
+    return None
+
+
+def put(key: str, response: str):
+    global _writes
+    now = time.time()
+
+    with db_connection() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_used)
+            VALUES (?, ?, ?, ?)
+            """,
+            (key, response, now, now)
+        )
+        conn.commit()
+
+        _writes += 1
+        if _writes % _EVICT_EVERY == 0:
+            _evict(conn, now)
+
+    _remember(key, response, now)
+
+
+def record_bypass():
+    _stats["bypassed"] += 1
+
+
+def _remember(key, response, created_at):
+    with _lock:
+        _memory[key] = (created_at + LLM_CACHE_TTL_SECONDS, response)
+        _memory.move_to_end(key)
+        while len(_memory) > LLM_CACHE_MEMORY_SIZE:
+            _memory.popitem(last=False)
+
+
+def _flush_touched(conn):
+    with _lock:
+        touched = list(_touched.items())
+        _touched.clear()
+    conn.executemany(
+        "UPDATE llm_cache SET last_used = MAX(last_used, ?) WHERE key = ?",
+        [(used, key) for key, used in touched]
+    )
+    conn.commit()
+
+
+def _evict(conn, now):
+    # Recent hits count before picking the least recently used rows
+    _flush_touched(conn)
+    conn.execute(
+        "DELETE FROM llm_cache WHERE created_at < ?",
+        (now - LLM_CACHE_TTL_SECONDS,)
+    )
+    # Least recently used rows beyond the size cap
+    conn.execute(
+        """
+        DELETE FROM llm_cache WHERE key IN (
+            SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+        )
+        """,
+        (LLM_CACHE_MAX_ROWS,)
+    )
+    conn.commit()
+
+
+def cache_stats() -> dict:
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "memory_size": len(_memory)
+    }
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from google.api_core import exceptions as google_exceptions
+from config import (
+    LLM_TIMEOUT_SECONDS,
+    LLM_ATTEMPT_TIMEOUT_SECONDS,
+    LLM_RETRIES,
+    LLM_RETRY_BASE_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_SECONDS,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SECONDS
+)
+
+# Everything interview_engine sends to the model goes through call():
+#
+#   - one overall deadline per call, and a shorter one per attempt so a
+#     hung attempt still leaves time to retry
+#   - transient upstream errors are retried with full-jitter backoff
+#   - optionally hedged: if an attempt is slower than the recent p95, a
+#     second identical request is fired and the first answer wins
+#   - a circuit breaker stops calling a failing upstream for a while;
+#     callers get CircuitOpenError and degrade (cache, question bank)
+
+logger = logging.getLogger(__name__)
+
+# Worth another attempt; anything else (bad request, blocked prompt) isn't
+RETRYABLE = (
+    TimeoutError,
+    ConnectionError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded
+)
+
+
+class CircuitOpenError(Exception):
+    """The model is not being called because it has been failing."""
+
+
+class CircuitBreaker:
+    """closed -> open after N consecutive failures -> half-open probe."""
+
+    def __init__(self, failures: int, reset_seconds: float):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._consecutive = 0
+        self._changed_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if time.monotonic() - self._changed_at < self.reset_seconds:
+                return False
+            # Let one probe through; if it never reports back (cancelled),
+            # another is allowed after reset_seconds
+            self._set("half-open")
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            if self.state != "closed":
+                logger.info("LLM circuit closed")
+                self._set("closed")
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == "half-open" or (
+                self.state == "closed" and self._consecutive >= self.failures
+            ):
+                logger.warning("LLM circuit open for %ss", self.reset_seconds)
+                self._set("open")
+
+    def _set(self, state):
+        self.state = state
+        self._changed_at = time.monotonic()
+
+
+breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+
+_latencies = deque(maxlen=200)  # seconds, successful attempts only
+_stats = {
+    "calls": 0,
+    "retries": 0,
+    "hedged": 0,
+    "hedge_wins": 0,
+    "failures": 0,
+    "rejected": 0
+}
+
+
+def hedge_delay():
+    """Recent p95 attempt latency, or None while there is too little data."""
+    if len(_latencies) < 20:
+        return None
+    ordered = sorted(_latencies)
+    return max(LLM_HEDGE_MIN_SECONDS, ordered[int(len(ordered) * 0.95)])
+
+
+async def _timed(attempt):
+    start = time.perf_counter()
+    result = await attempt()
+    _latencies.append(time.perf_counter() - start)
+    return result
+
+
+async def _hedged(attempt):
+    first = asyncio.ensure_future(_timed(attempt))
+    tasks = [first]
+    try:
+        delay = hedge_delay()
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return first.result()
+
+        _stats["hedged"] += 1
+        tasks.append(asyncio.ensure_future(_timed(attempt)))
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is not first:
+                        _stats["hedge_wins"] += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call(
+    attempt,
+    deadline: float = LLM_TIMEOUT_SECONDS,
+    attempt_timeout: float = LLM_ATTEMPT_TIMEOUT_SECONDS,
+    hedge: bool = True
+):
+    """Run attempt() (a coroutine factory) with deadline, retries and hedging."""
+    if not breaker.allow():
+        _stats["rejected"] += 1
+        raise CircuitOpenError("LLM circuit is open")
+
+    _stats["calls"] += 1
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    hedge = hedge and LLM_HEDGE_ENABLED
+
+    for n in range(LLM_RETRIES + 1):
+        timeout = min(attempt_timeout, end - loop.time())
+        try:
+            if timeout <= 0:
+                raise TimeoutError("LLM deadline exceeded")
+            result = await asyncio.wait_for(
+                _hedged(attempt) if hedge else _timed(attempt), timeout
+            )
+        except RETRYABLE:
+            _stats["failures"] += 1
+            breaker.record_failure()
+            # Full jitter: a burst of failures doesn't retry in lockstep
+            backoff = random.uniform(0, LLM_RETRY_BASE_SECONDS * 2 ** n)
+            if (
+                n == LLM_RETRIES
+                or breaker.state != "closed"
+                or loop.time() + backoff >= end
+            ):
+                raise
+            _stats["retries"] += 1
+            await asyncio.sleep(backoff)
+            continue
+        except Exception:
+            # The upstream answered, just not usefully
+            breaker.record_success()
+            raise
+
+        breaker.record_success()
+        return result
+
+
+def client_stats() -> dict:
+    return {
+        **_stats,
+        "circuit": breaker.state,
+        "hedge_delay": hedge_delay()
+    }
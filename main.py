@@ -5,27 +5,99 @@ from fastapi import (
     Request,
     UploadFile,
     File,
-    Form
+    Form,
+    Query,
+    Response
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse
+)
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, EmailStr
+import asyncio
+import base64
+import hashlib
+import json
+import anyio
+from typing import List
 from datetime import datetime
-from pathlib import Path
 from fastapi import Request
 from fastapi import APIRouter
 from fastapi.security import OAuth2PasswordBearer
-from database import init_db, get_db_connection
+from starlette.concurrency import run_in_threadpool
+from database import init_db, get_db, db_connection, pool_stats
+import llm_cache
+import llm_client
+import metrics
+import prompt_builder
 from auth import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password_async,
+    invalidate_user,
     create_access_token,
-    get_current_user
+    get_current_user,
+    auth_cache_stats,
+    hashing_slots
+)
+from interview_engine import (
+    stream_evaluation,
+    take_question,
+    stream_question,
+    prefetch_question,
+    has_prefetch,
+    discard_prefetch,
+    parse_evaluation,
+    FeedbackStream,
+    llm_slots,
+    prefetch_count
+)
+from llm_client import CircuitOpenError
+from pdf_extract import PDFExtractionError
+from static_assets import StaticAssets, PageCache
+from uploads import (
+    save_resume,
+    hash_upload,
+    is_zip,
+    save_batch_zip,
+    count_zip_resumes,
+    iter_zip_resumes,
+    UploadLimitMiddleware
+)
+from question_bank import (
+    load_index as load_question_bank,
+    seed_bank,
+    start_reloading as start_question_bank_reloading,
+    stop_reloading as stop_question_bank_reloading
+)
+from workers import run_cpu_job, shutdown_workers, parse_slots
+from evaluation_queue import (
+    notify_new_job,
+    score_deferred,
+    wait_for_interview,
+    queue_depth,
+    start_workers as start_evaluation_workers,
+    stop_workers as stop_evaluation_workers
+)
+from config import (
+    EVALUATION_WAIT_SECONDS,
+    MAX_BATCH_FILES,
+    MAX_BATCH_UPLOAD_BYTES,
+    MAX_RESUME_BYTES,
+    MAX_CONCURRENT_PARSES,
+    MY_INTERVIEWS_PAGE_SIZE,
+    MY_INTERVIEWS_MAX_PAGE_SIZE,
+    QUESTION_BANK_AUTOSEED,
+    LLM_BREAKER_RESET_SECONDS,
+    METRICS_ENABLED
+)
+from resume_parser import (
+    cache_resume_text,
+    get_resume_text
 )
-from interview_engine import generate_question, evaluate_answer
-from resume_parser import extract_text_from_pdf
 
 # =====================================================
 # APP INITIALIZATION
@@ -37,28 +109,81 @@ app = FastAPI(title="AI Mock Interview App")
 # CORS (FIXES OPTIONS 405)
 # =====================================================
 
+# Oversized uploads are refused before their body is read. Added first so
+# it sits inside CORS and the 413 still carries CORS headers.
+app.add_middleware(
+    UploadLimitMiddleware,
+    default=MAX_RESUME_BYTES,
+    limits={"/cv-optimization/analyze-batch": MAX_BATCH_UPLOAD_BYTES}
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],       # localhost dev
     allow_credentials=True,
     allow_methods=["*"],       # includes OPTIONS
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # =====================================================
 # STATIC FILES & TEMPLATES
 # =====================================================
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+static_assets = StaticAssets("static")
+app.mount("/static", static_assets, name="static")
 templates = Jinja2Templates(directory="templates")
+pages = PageCache(templates, static_assets)
+
+MAX_QUESTIONS = 5
 
 # =====================================================
 # STARTUP
 # =====================================================
 
 @app.on_event("startup")
-def startup():
+async def startup():
+    global _thread_limiter
+    _thread_limiter = anyio.to_thread.current_default_thread_limiter()
     init_db()
+    prune_analyses()
+    load_question_bank()
+    start_question_bank_reloading()
+    start_evaluation_workers()
+    if QUESTION_BANK_AUTOSEED:
+        asyncio.create_task(seed_bank())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    stop_question_bank_reloading()
+    await stop_evaluation_workers()
+    shutdown_workers()
+
+
+@app.exception_handler(TimeoutError)
+async def llm_timeout_handler(request: Request, exc: TimeoutError):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "AI model took too long to respond"}
+    )
+
+
+@app.exception_handler(CircuitOpenError)
+async def llm_unavailable_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "AI model is temporarily unavailable"},
+        headers={"Retry-After": str(int(LLM_BREAKER_RESET_SECONDS))}
+    )
+
+
+@app.exception_handler(PDFExtractionError)
+async def pdf_error_handler(request: Request, exc: PDFExtractionError):
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
 
 # =====================================================
 # SCHEMAS
@@ -86,45 +211,157 @@ class AnswerRequest(BaseModel):
 
 @app.get("/", response_class=HTMLResponse)
 def home_page(request: Request):
-    return templates.TemplateResponse("home.html", {"request": request})
+    return pages.render(request, "home.html")
+
+# =====================================================
+# METRICS
+# =====================================================
+
+# The event loop's threadpool limiter, read by the collectors below; they
+# run in that threadpool, where anyio can't look it up
+_thread_limiter = None
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # Some collectors query SQLite (queue depth), so none run on the loop
+    body = await run_in_threadpool(metrics.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+@metrics.collector
+def _saturation_metrics():
+    pool = pool_stats()
+    limiter = _thread_limiter or anyio.to_thread.current_default_thread_limiter()
+    slots = {
+        "threadpool": {
+            "in_use": limiter.borrowed_tokens,
+            "capacity": limiter.total_tokens
+        },
+        "password_hash": hashing_slots(),
+        "pdf_parse": parse_slots(),
+        "llm": llm_slots()
+    }
+    return [
+        ("db_pool_connections", "gauge", "Pooled SQLite connections by state.", [
+            ({"state": "idle"}, pool["idle"]),
+            ({"state": "in_use"}, pool["in_use"])
+        ]),
+        ("worker_slots_in_use", "gauge", "Busy slots of each bounded pool.", [
+            ({"pool": name}, s["in_use"]) for name, s in slots.items()
+        ]),
+        ("worker_slots_capacity", "gauge", "Size of each bounded pool.", [
+            ({"pool": name}, s["capacity"]) for name, s in slots.items()
+        ]),
+        ("evaluation_queue_pending", "gauge", "Answers waiting to be scored.", [
+            ({}, queue_depth())
+        ]),
+        ("question_prefetch_in_flight", "gauge", "Prefetched next questions held.", [
+            ({}, prefetch_count())
+        ])
+    ]
+
+
+@metrics.collector
+def _cache_metrics():
+    auth_stats = auth_cache_stats()
+    llm_stats = llm_cache.cache_stats()
+    resume_stats = get_resume_text.cache_info()
+    caches = {
+        "auth_token": (auth_stats["tokens"]["hits"], auth_stats["tokens"]["misses"]),
+        "auth_user": (auth_stats["users"]["hits"], auth_stats["users"]["misses"]),
+        "llm": (llm_stats["memory_hits"] + llm_stats["db_hits"], llm_stats["misses"]),
+        "resume_text": (resume_stats.hits, resume_stats.misses)
+    }
+    return [
+        ("cache_hits_total", "counter", "Cache lookups answered from the cache.", [
+            ({"cache": name}, hits) for name, (hits, _) in caches.items()
+        ]),
+        ("cache_misses_total", "counter", "Cache lookups that fell through.", [
+            ({"cache": name}, misses) for name, (_, misses) in caches.items()
+        ])
+    ]
+
+
+@metrics.collector
+def _llm_metrics():
+    client = llm_client.client_stats()
+    events = ("retries", "hedged", "hedge_wins", "failures", "rejected")
+    return [
+        ("llm_client_events_total", "counter", "Retries, hedges and breaker rejections.", [
+            ({"event": event}, client[event]) for event in events
+        ]),
+        ("llm_circuit_state", "gauge", "1 for the circuit breaker's current state.", [
+            ({"state": state}, int(client["circuit"] == state))
+            for state in ("closed", "open", "half-open")
+        ]),
+        ("llm_prompt_tokens_saved_total", "counter", "Tokens saved by the prompt budget.", [
+            ({"template": template}, s["tokens_saved"])
+            for template, s in prompt_builder.prompt_stats().items()
+        ])
+    ]
 
 # =====================================================
 # AUTH ROUTES
 # =====================================================
 
-@app.post("/signup")
-def signup(data: SignupRequest):
-    conn = get_db_connection()
-
-    if conn.execute(
-        "SELECT id FROM users WHERE email = ?",
-        (data.email,)
-    ).fetchone():
-        conn.close()
-        raise HTTPException(status_code=400, detail="Email already registered")
+# Routes below are async so password hashing and model calls can be awaited;
+# their SQLite work goes through run_in_threadpool so a slow query or a
+# lock wait (busy_timeout) never blocks the event loop.
+
+def _user_by_email(conn, email):
+    return conn.execute(
+        "SELECT * FROM users WHERE email = ?",
+        (email,)
+    ).fetchone()
+
 
+def _create_user(conn, data, password_hash):
     conn.execute(
         "INSERT INTO users (name, email, password_hash) VALUES (?, ?, ?)",
-        (data.name, data.email, hash_password(data.password))
+        (data.name, data.email, password_hash)
+    )
+    conn.commit()
+
+
+def _update_password_hash(conn, user_id, password_hash):
+    conn.execute(
+        "UPDATE users SET password_hash = ? WHERE id = ?",
+        (password_hash, user_id)
     )
     conn.commit()
-    conn.close()
+
+
+@app.post("/signup")
+async def signup(data: SignupRequest, conn=Depends(get_db)):
+    if await run_in_threadpool(_user_by_email, conn, data.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    password_hash = await hash_password_async(data.password)
+    await run_in_threadpool(_create_user, conn, data, password_hash)
 
     return {"message": "Signup successful"}
 
 
 @app.post("/login")
-def login(data: LoginRequest):
-    conn = get_db_connection()
-    user = conn.execute(
-        "SELECT * FROM users WHERE email = ?",
-        (data.email,)
-    ).fetchone()
-    conn.close()
+async def login(data: LoginRequest, conn=Depends(get_db)):
+    user = await run_in_threadpool(_user_by_email, conn, data.email)
+
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not user or not verify_password(data.password, user["password_hash"]):
+    valid, new_hash = await verify_and_update_password_async(
+        data.password, user["password_hash"]
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # Hash was made with an older BCRYPT_ROUNDS; upgrade it while we have
+    # the plaintext
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, conn, user["id"], new_hash)
+        invalidate_user(user["id"])
+
     token = create_access_token({"user_id": user["id"]})
     return {"access_token": token, "token_type": "bearer"}
 
@@ -134,27 +371,27 @@ def login(data: LoginRequest):
 
 @app.get("/signup", response_class=HTMLResponse)
 def signup_page(request: Request):
-    return templates.TemplateResponse("signup.html", {"request": request})
+    return pages.render(request, "signup.html")
 
 
 @app.get("/login", response_class=HTMLResponse)
 def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    return pages.render(request, "login.html")
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard_page(request: Request):
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return pages.render(request, "dashboard.html")
 
 
 @app.get("/interview", response_class=HTMLResponse)
 def interview_page(request: Request):
-    return templates.TemplateResponse("interview.html", {"request": request})
+    return pages.render(request, "interview.html")
 
 
 @app.get("/result", response_class=HTMLResponse)
 def result_page(request: Request):
-    return templates.TemplateResponse("result.html", {"request": request})
+    return pages.render(request, "result.html")
 
 # =====================================================
 # INTERVIEW FLOW
@@ -165,19 +402,19 @@ def start_interview(
     job_title: str = Form(None),
     job_description: str = Form(None),
     resume: UploadFile = File(None),
-    current_user=Depends(get_current_user)
+    deferred_scoring: bool = Form(False),
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
 ):
     resume_path = None
+    resume_hash = None
 
     if resume:
-        resumes_dir = Path("resumes")
-        resumes_dir.mkdir(exist_ok=True)
-        resume_path = resumes_dir / f"{current_user['id']}_{resume.filename}"
+        resume_path, resume_hash = save_resume(resume)
 
-        with open(resume_path, "wb") as f:
-            f.write(resume.file.read())
+        # Parse once here; /next-question only reads the cached text
+        cache_resume_text(resume_path, resume_hash)
 
-    conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("""
     INSERT INTO interviews (
@@ -185,61 +422,48 @@ def start_interview(
         job_title,
         job_description,
         resume_path,
+        resume_hash,
+        scoring_mode,
         created_at
     )
-    VALUES (?, ?, ?, ?, ?)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
 """, (
     current_user["id"],
     job_title,
     job_description,
     str(resume_path) if resume_path else None,
+    resume_hash,
+    "deferred" if deferred_scoring else "live",
     datetime.utcnow().isoformat()
 ))
 
     interview_id = cursor.lastrowid
     conn.commit()
-    conn.close()
 
     return {"interview_id": interview_id}
 
 
 @app.get("/next-question")
-def next_question(interview_id: int, current_user=Depends(get_current_user)):
-    conn = get_db_connection()
-
-    interview = conn.execute(
-        "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
-        (interview_id, current_user["id"])
-    ).fetchone()
-
-    if not interview:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Interview not found")
-
-    count = conn.execute(
-        "SELECT COUNT(*) as total FROM questions WHERE interview_id = ?",
-        (interview_id,)
-    ).fetchone()["total"]
+async def next_question(
+    interview_id: int,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    interview, count, resume_text = await run_in_threadpool(
+        _load_interview_state, conn, interview_id, current_user
+    )
 
-    if count >= 5:
-        conn.close()
+    if count >= MAX_QUESTIONS:
         return {"end": True}
 
-    resume_text = None
-    if interview["resume_path"]:
-       resume_text = extract_text_from_pdf(interview["resume_path"])
-
-    job_description = interview["job_description"]
-
-    conn.close()
-
-    question = generate_question(
+    question = await take_question(
     interview_id=interview_id,
     job_title=interview["job_title"],
-    job_description=job_description,
+    job_description=interview["job_description"],
     resume_text=resume_text
 )
 
+    _prefetch_following(interview, count, resume_text, question)
 
     return {
         "end": False,
@@ -248,60 +472,308 @@ def next_question(interview_id: int, current_user=Depends(get_current_user)):
     }
 
 
-@app.post("/submit-answer")
-def submit_answer(data: AnswerRequest, current_user=Depends(get_current_user)):
-    evaluation = evaluate_answer(data.question, data.answer)
-
-    score = int(
-        [l for l in evaluation.splitlines() if "Score" in l][0].split(":")[1].strip()
+@app.get("/next-question/stream")
+async def next_question_stream(
+    interview_id: int,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    interview, count, resume_text = await run_in_threadpool(
+        _load_interview_state, conn, interview_id, current_user
     )
-    feedback = (
-        [l for l in evaluation.splitlines() if "Feedback" in l][0]
-        .split(":", 1)[1]
-        .strip()
+
+    async def events():
+        if count >= MAX_QUESTIONS:
+            yield _sse("end", {"end": True})
+            return
+
+        try:
+            if has_prefetch(interview_id):
+                # Already generated (or nearly) in the background
+                question = await take_question(
+                    interview_id,
+                    interview["job_title"],
+                    interview["job_description"],
+                    resume_text
+                )
+                yield _sse("token", {"text": question})
+            else:
+                parts = []
+                async for text in stream_question(
+                    interview_id,
+                    interview["job_title"],
+                    interview["job_description"],
+                    resume_text
+                ):
+                    parts.append(text)
+                    yield _sse("token", {"text": text})
+                question = "".join(parts).strip()
+        except Exception:
+            yield _sse("error", {"detail": "Could not generate question"})
+            return
+
+        _prefetch_following(interview, count, resume_text, question)
+
+        yield _sse("question", {
+            "end": False,
+            "question_number": count + 1,
+            "question": question
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/submit-answer")
+async def submit_answer(
+    data: AnswerRequest,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    # Scored by the background evaluation workers (poll /answer-status),
+    # or left for one batch call at the end in deferred scoring mode
+    question_id, status, follow_up = await run_in_threadpool(
+        _record_answer, conn, data, current_user
     )
+    if status == "pending":
+        notify_new_job()
+    _prefetch_after_answer(follow_up)
 
-    conn = get_db_connection()
-    conn.execute(
+    return {"question_id": question_id, "status": status}
+
+
+def _answer_row(conn, question_id, current_user):
+    return conn.execute(
         """
-        INSERT INTO questions (interview_id, question, answer, score, feedback)
-        VALUES (?, ?, ?, ?, ?)
+        SELECT q.id, q.status, q.score, q.feedback
+        FROM questions q
+        JOIN interviews i ON i.id = q.interview_id
+        WHERE q.id = ? AND i.user_id = ?
+        """,
+        (question_id, current_user["id"])
+    ).fetchone()
+
+
+@app.get("/answer-status")
+async def answer_status(
+    question_id: int,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    row = await run_in_threadpool(_answer_row, conn, question_id, current_user)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Answer not found")
+
+    return {
+        "question_id": row["id"],
+        "status": row["status"],
+        "score": row["score"],
+        "feedback": row["feedback"]
+    }
+
+
+@app.post("/submit-answer/stream")
+async def submit_answer_stream(
+    data: AnswerRequest,
+    current_user=Depends(get_current_user)
+):
+    async def events():
+        # The model streams a JSON object; only its feedback text is sent
+        # as tokens, for display and speech, and the score comes with result
+        parts = []
+        feedback_stream = FeedbackStream()
+        try:
+            async for text in stream_evaluation(data.question, data.answer):
+                parts.append(text)
+                feedback_text = feedback_stream.feed(text)
+                if feedback_text:
+                    yield _sse("token", {"text": feedback_text})
+            score, feedback = parse_evaluation("".join(parts))
+        except Exception:
+            yield _sse("error", {"detail": "Could not evaluate answer"})
+            return
+
+        # Persist only once the full evaluation has arrived. The response
+        # body outlives the request's own connection, so borrow another.
+        _, _, follow_up = await run_in_threadpool(
+            _record_answer_detached, data, current_user, score, feedback
+        )
+        _prefetch_after_answer(follow_up)
+
+        yield _sse("result", {"score": score, "feedback": feedback})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _load_interview_state(conn, interview_id, current_user):
+    interview = conn.execute(
+        "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
+        (interview_id, current_user["id"])
+    ).fetchone()
+
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    count = interview["question_count"]
+
+    resume_text = None
+    if count < MAX_QUESTIONS:
+        resume_text = _interview_resume_text(conn, interview)
+
+    return interview, count, resume_text
+
+
+def _prefetch_following(interview, count, resume_text, question=None):
+    # Start on the following question while this one is being answered
+    if count + 1 < MAX_QUESTIONS:
+        prefetch_question(
+            interview["id"],
+            interview["job_title"],
+            interview["job_description"],
+            resume_text,
+            pending_question=question
+        )
+
+
+def _record_answer(conn, data, current_user, score=None, feedback=None):
+    """Store an answer; returns (question_id, status, follow-up to prefetch)."""
+    interview = conn.execute(
+        "SELECT * FROM interviews WHERE id = ? AND user_id = ?",
+        (data.interview_id, current_user["id"])
+    ).fetchone()
+
+    if score is not None:
+        status = "done"
+    elif interview and interview["scoring_mode"] == "deferred":
+        status = "deferred"
+    else:
+        status = "pending"
+
+    cursor = conn.execute(
+        """
+        INSERT INTO questions (
+            interview_id, question, answer, score, feedback, status
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
         """,
         (
             data.interview_id,
             data.question,
             data.answer,
             score,
-            feedback
+            feedback,
+            status
         )
     )
+    question_id = cursor.lastrowid
     conn.commit()
-    conn.close()
 
-    return {"score": score, "feedback": feedback}
+    # The row was read before this insert, hence + 1
+    follow_up = None
+    if interview and interview["question_count"] + 1 < MAX_QUESTIONS:
+        # Best effort: the answer is already stored, so a resume that can't
+        # be read must not fail the request (a retry would store it twice)
+        try:
+            follow_up = (interview, _interview_resume_text(conn, interview))
+        except (HTTPException, OSError, PDFExtractionError):
+            pass
+
+    return question_id, status, follow_up
+
+
+def _record_answer_detached(data, current_user, score, feedback):
+    with db_connection() as conn:
+        return _record_answer(conn, data, current_user, score, feedback)
+
+
+def _prefetch_after_answer(follow_up):
+    # Covers the case where nothing was prefetched when this question was
+    # served; runs on the event loop, which owns the prefetch tasks
+    if follow_up:
+        interview, resume_text = follow_up
+        prefetch_question(
+            interview["id"],
+            interview["job_title"],
+            interview["job_description"],
+            resume_text
+        )
+
+
+def _interview_resume_text(conn, interview):
+    if not interview["resume_path"]:
+        return None
+
+    resume_hash = interview["resume_hash"]
+    if not resume_hash:
+        # Interviews started before the parse cache existed; resume_hash
+        # stays unset if the file is gone or unreadable
+        try:
+            resume_hash = cache_resume_text(interview["resume_path"])
+        except OSError:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        except PDFExtractionError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        conn.execute(
+            "UPDATE interviews SET resume_hash = ? WHERE id = ?",
+            (resume_hash, interview["id"])
+        )
+        conn.commit()
+
+    try:
+        return get_resume_text(resume_hash)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Resume not found")
 
 # =====================================================
 # FINAL FEEDBACK
 # =====================================================
 
-@app.get("/final-feedback")
-def final_feedback(interview_id: int, current_user=Depends(get_current_user)):
-    conn = get_db_connection()
-    rows = conn.execute(
-        "SELECT score FROM questions WHERE interview_id = ?",
+def _average_score(conn, interview_id):
+    # Running totals kept by triggers on questions (see database.py)
+    row = conn.execute(
+        "SELECT answered_count, skipped_count, score_sum FROM interviews WHERE id = ?",
         (interview_id,)
-    ).fetchall()
+    ).fetchone()
+
+    # Skipped questions count as 0
+    scored = row["answered_count"] + row["skipped_count"] if row else 0
+    if not scored:
+        return None
+    return round(row["score_sum"] / scored, 1)
+
+
+@app.get("/final-feedback")
+async def final_feedback(
+    interview_id: int,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    # Checked first: the calls below drop prefetches and start LLM scoring
+    interview = await run_in_threadpool(_owned_interview, conn, interview_id, current_user)
+
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    discard_prefetch(interview_id)
+    await score_deferred(interview_id)
+    await wait_for_interview(interview_id, EVALUATION_WAIT_SECONDS)
+
+    return await run_in_threadpool(_final_feedback, conn, interview_id)
+
+
+def _final_feedback(conn, interview_id):
+    avg_score = _average_score(conn, interview_id)
 
-    if not rows:
-        conn.close()
+    if avg_score is None:
         return {
             "summary": "No answers submitted. Score not available.",
             "score": 0
         }
 
-    # ✅ Calculate average score from AVAILABLE answers (1 or more)
-    avg_score = round(sum(r["score"] for r in rows) / len(rows), 1)
-
     if avg_score >= 7:
         result = "Good performance. Strong fundamentals."
     elif avg_score >= 5:
@@ -317,7 +789,6 @@ def final_feedback(interview_id: int, current_user=Depends(get_current_user)):
         (avg_score, summary, interview_id)
     )
     conn.commit()
-    conn.close()
 
     return {
         "summary": summary,
@@ -329,19 +800,127 @@ def final_feedback(interview_id: int, current_user=Depends(get_current_user)):
 # INTERVIEW HISTORY
 # =====================================================
 
+# Fields a client may ask for with ?fields=; final_feedback is opt-in
+INTERVIEW_FIELDS = ("id", "job_title", "final_score", "final_feedback", "created_at")
+DEFAULT_INTERVIEW_FIELDS = ("id", "job_title", "final_score", "created_at")
+
+
+def _encode_cursor(row) -> str:
+    raw = json.dumps([row["created_at"], row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, interview_id = json.loads(raw)
+        return str(created_at), int(interview_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @app.get("/my-interviews")
-def my_interviews(current_user=Depends(get_current_user)):
-    conn = get_db_connection()
-    rows = conn.execute("""
-        SELECT id, job_title, final_score, final_feedback, created_at
+def my_interviews(
+    request: Request,
+    cursor: str = None,
+    limit: int = Query(MY_INTERVIEWS_PAGE_SIZE, ge=1, le=MY_INTERVIEWS_MAX_PAGE_SIZE),
+    fields: str = None,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    """
+    Finished interviews, newest first, one page at a time. The body stays a
+    JSON list; X-Next-Cursor carries the cursor for the next page when
+    there is one. Pages are keyed on (created_at, id), so each one is an
+    index range scan however deep the client has paged.
+    """
+    selected = DEFAULT_INTERVIEW_FIELDS
+    if fields:
+        selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = set(selected) - set(INTERVIEW_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+    # Always read the keyset columns; they're dropped from the output below
+    columns = list(dict.fromkeys(selected + ("created_at", "id")))
+
+    after = ""
+    params = [current_user["id"]]
+    if cursor:
+        created_at, interview_id = _decode_cursor(cursor)
+        # Row-value comparison, so SQLite seeks the index to the cursor
+        after = "AND (created_at, id) < (?, ?)"
+        params += [created_at, interview_id]
+
+    rows = conn.execute(f"""
+        SELECT {", ".join(columns)}
         FROM interviews
         WHERE user_id = ?
         AND final_score IS NOT NULL
-        ORDER BY created_at DESC
-    """, (current_user["id"],)).fetchall()
-    conn.close()
+        {after}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, (*params, limit + 1)).fetchall()
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(rows[-1])
+
+    body = json.dumps([{f: r[f] for f in selected} for r in rows]).encode()
+    etag = '"' + hashlib.sha256(
+        body + headers.get("X-Next-Cursor", "").encode()
+    ).hexdigest()[:32] + '"'
+    headers["ETag"] = etag
+
+    client_tags = request.headers.get("if-none-match", "").split(",")
+    if etag in (t.strip().removeprefix("W/") for t in client_tags):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Finished interviews compared against the overall average for the trend
+STATS_TREND_WINDOW = 5
+
+
+@app.get("/my-stats")
+def my_stats(current_user=Depends(get_current_user), conn=Depends(get_db)):
+    # Totals are kept by a trigger on interviews.final_score (see database.py)
+    stats = conn.execute(
+        "SELECT * FROM user_stats WHERE user_id = ?", (current_user["id"],)
+    ).fetchone()
+
+    if not stats or not stats["interview_count"]:
+        return {
+            "interview_count": 0,
+            "average_score": None,
+            "best_score": None,
+            "last_score": None,
+            "recent_average": None,
+            "trend": None
+        }
+
+    recent = conn.execute("""
+        SELECT final_score FROM interviews
+        WHERE user_id = ? AND final_score IS NOT NULL
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, (current_user["id"], STATS_TREND_WINDOW)).fetchall()
+
+    average = stats["score_sum"] / stats["interview_count"]
+    recent_average = sum(r["final_score"] for r in recent) / len(recent)
 
-    return [dict(r) for r in rows]
+    return {
+        "interview_count": stats["interview_count"],
+        "average_score": round(average, 1),
+        "best_score": stats["best_score"],
+        "last_score": stats["last_score"],
+        "recent_average": round(recent_average, 1),
+        # > 0: the last few interviews went better than usual
+        "trend": round(recent_average - average, 1)
+    }
 
 
 # =====================================================
@@ -349,13 +928,20 @@ def my_interviews(current_user=Depends(get_current_user)):
 #===================================================
 
 @app.post("/skip-question")
-def skip_question(data: AnswerRequest, current_user=Depends(get_current_user)):
-    conn = get_db_connection()
+async def skip_question(
+    data: AnswerRequest,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    await run_in_threadpool(_record_skip, conn, data)
+    return {"message": "Question skipped"}
+
 
+def _record_skip(conn, data):
     conn.execute(
         """
-        INSERT INTO questions (interview_id, question, answer, score, feedback)
-        VALUES (?, ?, ?, ?, ?)
+        INSERT INTO questions (interview_id, question, answer, score, feedback, status)
+        VALUES (?, ?, ?, ?, ?, 'skipped')
         """,
         (
             data.interview_id,
@@ -367,35 +953,41 @@ def skip_question(data: AnswerRequest, current_user=Depends(get_current_user)):
     )
 
     conn.commit()
-    conn.close()
-
-    return {"message": "Question skipped"}
 
 # =====================================================
 # END INTERVIEW  
 # ===================================================
 
 @app.post("/end-interview")
-def end_interview(interview_id: int, current_user=Depends(get_current_user)):
-    conn = get_db_connection()
+async def end_interview(
+    interview_id: int,
+    current_user=Depends(get_current_user),
+    conn=Depends(get_db)
+):
+    interview = await run_in_threadpool(_owned_interview, conn, interview_id, current_user)
 
-    interview = conn.execute(
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    discard_prefetch(interview_id)
+    await score_deferred(interview_id)
+    await wait_for_interview(interview_id, EVALUATION_WAIT_SECONDS)
+
+    avg_score = await run_in_threadpool(_close_interview, conn, interview_id)
+    return {"message": "Interview ended", "final_score": avg_score or 0}
+
+
+def _owned_interview(conn, interview_id, current_user):
+    return conn.execute(
         "SELECT id FROM interviews WHERE id = ? AND user_id = ?",
         (interview_id, current_user["id"])
     ).fetchone()
 
-    if not interview:
-        conn.close()
-        raise HTTPException(status_code=404, detail="Interview not found")
 
-    # 🔥 Fetch all scores (even 1 answer)
-    rows = conn.execute(
-        "SELECT score FROM questions WHERE interview_id = ?",
-        (interview_id,)
-    ).fetchall()
+def _close_interview(conn, interview_id):
+    avg_score = _average_score(conn, interview_id)
 
-    if rows:
-        avg_score = round(sum(r["score"] for r in rows) / len(rows), 1)
+    if avg_score is not None:
         feedback = f"Average Score: {avg_score}/10"
 
         conn.execute(
@@ -404,8 +996,7 @@ def end_interview(interview_id: int, current_user=Depends(get_current_user)):
         )
         conn.commit()
 
-    conn.close()
-    return {"message": "Interview ended", "final_score": avg_score if rows else 0}
+    return avg_score
 
 
 # =====================================================
@@ -421,23 +1012,17 @@ def options_handler(path: str):
 
 @app.get("/start-interview", response_class=HTMLResponse)
 def start_interview_page(request: Request):
-    return templates.TemplateResponse(
-        "interviewsetup.html",
-        {"request": request}
-    )
+    return pages.render(request, "interviewsetup.html")
 
 
 
 @app.get("/start-interview", response_class=HTMLResponse)
 def interview_setup_page(request: Request):
-    return templates.TemplateResponse(
-        "interviewsetup.html",
-        {"request": request}
-    )
+    return pages.render(request, "interviewsetup.html")
 
 @app.get("/interview", response_class=HTMLResponse)
 def interview_page(request: Request):
-    return templates.TemplateResponse("interview.html", {"request": request})
+    return pages.render(request, "interview.html")
 
 
 
@@ -447,28 +1032,19 @@ def interview_page(request: Request):
 # =====================================================
 @app.get("/recent-interviews", response_class=HTMLResponse)
 async def recent_interviews(request: Request):
-    return templates.TemplateResponse(
-        "recent_interviews.html",
-        {"request": request}
-    )
+    return pages.render(request, "recent_interviews.html")
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
-    return templates.TemplateResponse(
-        "dashboard.html",
-        {"request": request}
-)
+    return pages.render(request, "dashboard.html")
 
 #=====================================================
 # JOBS PAGE     
 #====================================================
 @app.get("/jobs", response_class=HTMLResponse)
 async def jobs(request: Request):
-    return templates.TemplateResponse(
-        "jobs.html",
-        {"request": request}
-    )
+    return pages.render(request, "jobs.html")
 
 
 
@@ -478,10 +1054,7 @@ async def jobs(request: Request):
 
 @app.get("/ai-careers", response_class=HTMLResponse)
 async def ai_careers(request: Request):
-    return templates.TemplateResponse(
-        "ai_careers.html",
-        {"request": request}
-    )
+    return pages.render(request, "ai_careers.html")
 
 
 
@@ -491,32 +1064,172 @@ async def ai_careers(request: Request):
 
 @app.get("/cv-optimization", response_class=HTMLResponse)
 async def cv_optimization(request: Request):
-    return templates.TemplateResponse(
-        "cv_optimization.html",
-        {"request": request}
-    )
+    return pages.render(request, "cv_optimization.html")
 
 
-from cv_analyzer import analyze_resume
+from cv_analyzer import (
+    analyze_resume_file,
+    load_analysis,
+    save_analysis,
+    prune_analyses
+)
 
 @app.post("/cv-optimization/analyze")
 async def analyze_cv(
     resume: UploadFile = File(...),
+    job_title: str = Form(None),
     current_user=Depends(get_current_user)
 ):
-    resumes_dir = Path("resumes")
-    resumes_dir.mkdir(exist_ok=True)
+    # Same file analyzed before: answer without saving or parsing it again
+    resume_hash = await run_in_threadpool(hash_upload, resume)
+    cached = await run_in_threadpool(load_analysis, resume_hash, job_title)
+    if cached is not None:
+        return cached
 
-    resume_path = resumes_dir / resume.filename
-    with open(resume_path, "wb") as f:
-        f.write(resume.file.read())
+    resume_path, _ = await run_in_threadpool(save_resume, resume)
 
-    text = extract_text_from_pdf(resume_path)
-    result = analyze_resume(text)
+    # Parsing and scoring are CPU-bound; keep them off the event loop
+    result = await run_cpu_job(analyze_resume_file, str(resume_path), job_title)
+    await run_in_threadpool(save_analysis, resume_hash, job_title, result)
 
     return result
 
 
+def _save_batch(uploads):
+    """
+    Copy every upload out of the request before the response starts
+    streaming (the request's files are closed once the handler returns).
+    Returns [(name, path, error)]; zips stay archives, saved as ("zip", path).
+    Raises 413 past MAX_BATCH_FILES before any resume is written.
+    """
+    zips = {}
+    try:
+        # Zips go to temp files first, only to count their PDFs
+        for i, upload in enumerate(uploads):
+            if is_zip(upload):
+                zips[i] = save_batch_zip(upload)
+
+        total = len(uploads) - len(zips) + sum(map(count_zip_resumes, zips.values()))
+        if total > MAX_BATCH_FILES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"A batch can hold at most {MAX_BATCH_FILES} resumes"
+            )
+
+        saved = []
+        for i, upload in enumerate(uploads):
+            name = upload.filename or "resume.pdf"
+            if i in zips:
+                saved.append((name, zips[i], "zip"))
+                continue
+            try:
+                saved.append((name, save_resume(upload)[0], None))
+            except HTTPException as exc:
+                saved.append((name, None, exc.detail))
+        return saved
+    except BaseException:
+        for path in zips.values():
+            path.unlink(missing_ok=True)
+        raise
+
+
+def _batch_sources(saved):
+    # Zip members are extracted one at a time, as the pool asks for work
+    for name, path, error in saved:
+        if error == "zip":
+            for member, member_path, member_error in iter_zip_resumes(path):
+                yield (f"{name}/{member}" if member else name), member_path, member_error
+        else:
+            yield name, path, error
+
+
+async def _analyze_batch_file(index, name, path, job_title):
+    # Saved resumes are named by content hash
+    resume_hash = path.stem
+    try:
+        result = await run_in_threadpool(load_analysis, resume_hash, job_title)
+        if result is None:
+            result = await run_cpu_job(analyze_resume_file, str(path), job_title)
+            await run_in_threadpool(save_analysis, resume_hash, job_title, result)
+    except HTTPException as exc:
+        return {"index": index, "file": name, "ok": False, "error": exc.detail}
+    except PDFExtractionError as exc:
+        return {"index": index, "file": name, "ok": False, "error": str(exc)}
+    except asyncio.CancelledError:
+        # Only this file's job was cancelled, not the batch itself
+        if asyncio.current_task().cancelling():
+            raise
+        return {"index": index, "file": name, "ok": False,
+                "error": "Resume could not be processed"}
+    except Exception:
+        return {"index": index, "file": name, "ok": False,
+                "error": "Could not read this PDF"}
+    return {"index": index, "file": name, "ok": True, **result}
+
+
+@app.post("/cv-optimization/analyze-batch")
+async def analyze_cv_batch(
+    resumes: List[UploadFile] = File(...),
+    job_title: str = Form(None),
+    current_user=Depends(get_current_user)
+):
+    """
+    Analyze many PDFs (or zips of PDFs) at once. Results stream back as
+    NDJSON, one line per file in completion order, then a summary line.
+    A file that fails gets an error line; the rest of the batch carries on.
+    """
+    saved = await run_in_threadpool(_save_batch, resumes)
+
+    async def results():
+        sources = _batch_sources(saved)
+        # Enough queued work to keep every parse slot busy, without
+        # extracting a whole archive up front
+        window = MAX_CONCURRENT_PARSES * 2
+        pending = set()
+        total = failed = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    item = await run_in_threadpool(next, sources, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        name, path, error = item
+                        index, total = total, total + 1
+                        if error:
+                            failed += 1
+                            yield json.dumps({
+                                "index": index, "file": name, "ok": False, "error": error
+                            }) + "\n"
+                        else:
+                            pending.add(asyncio.create_task(
+                                _analyze_batch_file(index, name, path, job_title)
+                            ))
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    line = task.result()
+                    failed += not line["ok"]
+                    yield json.dumps(line) + "\n"
+        finally:
+            # Client went away: stop queued work and remove leftover zips
+            for task in pending:
+                task.cancel()
+            await run_in_threadpool(sources.close)
+            for _, path, error in saved:
+                if error == "zip":
+                    path.unlink(missing_ok=True)
+
+        yield json.dumps({"done": True, "total": total, "failed": failed}) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
 
 
 # =====================================================
@@ -545,10 +1258,7 @@ async def get_me(user=Depends(get_current_user)):
 
 @app.get("/profile", response_class=HTMLResponse)
 async def profile_page(request: Request):
-    return templates.TemplateResponse(
-        "profile.html",
-        {"request": request}
-    )
+    return pages.render(request, "profile.html")
 
 
 # =====================================================
@@ -556,20 +1266,14 @@ async def profile_page(request: Request):
 # ===================================================== 
 @app.get("/support", response_class=HTMLResponse)
 async def support_page(request: Request):
-    return templates.TemplateResponse(
-        "support.html",
-        {"request": request}
-    )
+    return pages.render(request, "support.html")
 
 # ===================================================== 
 #billing page
 # ===================================================== 
 @app.get("/billing", response_class=HTMLResponse)
 async def billing_page(request: Request):
-    return templates.TemplateResponse(
-        "billing.html",
-        {"request": request}
-    )
+    return pages.render(request, "billing.html")
 
 
 
@@ -0,0 +1,178 @@
+import bisect
+import logging
+import threading
+import time
+
+# Minimal Prometheus-style instrumentation, served as text by /metrics.
+# Counters and histograms are updated inline (a lock and a few adds per
+# observation); everything that already keeps its own numbers (caches,
+# pools, the queue) is read at scrape time by collectors registered in
+# main.py.
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers cache hits (sub-ms) up to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+
+_metrics = []
+_collectors = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _header(lines, name, kind, help_text):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, lines):
+        _header(lines, self.name, "counter", self.help)
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            pairs = zip(self.labelnames, labels)
+            lines.append(f"{self.name}{_format_labels(list(pairs))} {value}")
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def observe(self, labels, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * (len(self.buckets) + 2)
+            entry[i] += 1
+            entry[-1] += value
+
+    def render(self, lines):
+        _header(lines, self.name, "histogram", self.help)
+        with self._lock:
+            values = [(labels, list(entry)) for labels, entry in self._values.items()]
+
+        for labels, entry in values:
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for le, count in zip(self.buckets + ("+Inf",), entry[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(pairs + [("le", le)])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {entry[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+
+
+def collector(fn):
+    """Register fn() -> [(name, kind, help, [(labels dict, value), ...]), ...]."""
+    _collectors.append(fn)
+    return fn
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        metric.render(lines)
+
+    for fn in _collectors:
+        try:
+            families = fn()
+        except Exception:
+            # One broken source must not take the whole scrape down
+            logger.exception("Metrics collector %s failed", fn.__name__)
+            continue
+        for name, kind, help_text, samples in families:
+            _header(lines, name, kind, help_text)
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(list(labels.items()))} {value}")
+
+    return "\n".join(lines) + "\n"
+
+# ---------------- APPLICATION METRICS ----------------
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to complete an HTTP request, including a streamed body.",
+    ("method", "route", "status")
+)
+LLM_SECONDS = Histogram(
+    "llm_call_duration_seconds",
+    "Duration of successful model calls, retries included.",
+    ("template",)
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Estimated tokens sent to and received from the model.",
+    ("template", "direction")
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "Model calls that failed after retries.",
+    ("template", "error")
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Time spent in SQLite execute()/executemany().",
+    ("operation", "table")
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording REQUEST_SECONDS by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                (scope["method"], route.path if route else "unmatched", str(status)),
+                time.perf_counter() - start
+            )
@@ -0,0 +1,127 @@
+import importlib.util
+import json
+import logging
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    PDF_BACKEND,
+    PDF_MAX_PAGES,
+    PDF_PAGES_PER_PROCESS,
+    PDF_EXTRACT_PROCESSES,
+    PDF_EXTRACT_TIMEOUT_SECONDS,
+    PDF_MEMORY_LIMIT_BYTES
+)
+
+# Uploaded PDFs are untrusted: a crafted or enormous file can spin the
+# parser or balloon its memory. Text is therefore extracted in throwaway
+# child processes (this file run as a script) that cap their own address
+# space and are killed at a wall-clock deadline.
+#
+# The first child reads the first PDF_PAGES_PER_PROCESS pages and reports
+# the page count, so a normal resume costs one process. Longer documents
+# (up to PDF_MAX_PAGES) are split into page ranges read by several
+# children at once.
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("pypdf2", "pymupdf")
+
+
+class PDFExtractionError(ValueError):
+    """The PDF couldn't be read within the limits."""
+
+
+def _backend() -> str:
+    if PDF_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown PDF_BACKEND {PDF_BACKEND!r}; expected one of {BACKENDS}")
+    if PDF_BACKEND == "pymupdf" and importlib.util.find_spec("fitz") is None:
+        logger.warning("PDF_BACKEND=pymupdf but PyMuPDF is not installed; using PyPDF2")
+        return "pypdf2"
+    return PDF_BACKEND
+
+
+BACKEND = _backend()
+
+# ---------------- CHILD PROCESS ----------------
+
+def _limit_resources(memory_bytes: int, cpu_seconds: int):
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows; the wall-clock kill still applies
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+
+
+def read_pages(path, first: int, last: int, backend: str = "pypdf2"):
+    """(page count, [text of pages first..last-1]); runs inside the child."""
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(path) as doc:
+            last = min(last, doc.page_count)
+            return doc.page_count, [doc[i].get_text() for i in range(first, last)]
+
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    count = len(reader.pages)
+    return count, [reader.pages[i].extract_text() or "" for i in range(first, min(last, count))]
+
+
+def _child_main(argv):
+    path, first, last, backend, memory_bytes, cpu_seconds = argv
+    _limit_resources(int(memory_bytes), int(cpu_seconds))
+    count, pages = read_pages(path, int(first), int(last), backend)
+    json.dump({"count": count, "pages": pages}, sys.stdout)
+
+# ---------------- PARENT ----------------
+
+def _run_child(path, first, last, deadline):
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise PDFExtractionError("PDF took too long to read")
+
+    args = [
+        sys.executable, __file__, str(path), str(first), str(last), BACKEND,
+        str(PDF_MEMORY_LIMIT_BYTES), str(int(PDF_EXTRACT_TIMEOUT_SECONDS) + 1)
+    ]
+    try:
+        # run() kills the child when the timeout expires
+        result = subprocess.run(args, capture_output=True, timeout=remaining)
+    except subprocess.TimeoutExpired:
+        raise PDFExtractionError("PDF took too long to read") from None
+
+    if result.returncode != 0:
+        error = result.stderr.decode(errors="replace").strip().splitlines()
+        logger.info("PDF extraction failed for %s: %s", path, error[-1] if error else result.returncode)
+        if b"MemoryError" in result.stderr:
+            raise PDFExtractionError("PDF needs too much memory to read")
+        raise PDFExtractionError("File is not a readable PDF")
+
+    data = json.loads(result.stdout)
+    return data["count"], data["pages"]
+
+
+def extract_pages(path, max_pages: int = PDF_MAX_PAGES):
+    """Text of each of the first max_pages pages of the PDF at path."""
+    deadline = time.monotonic() + PDF_EXTRACT_TIMEOUT_SECONDS
+    step = PDF_PAGES_PER_PROCESS
+
+    count, pages = _run_child(path, 0, min(step, max_pages), deadline)
+    ranges = [
+        (start, min(start + step, max_pages))
+        for start in range(step, min(count, max_pages), step)
+    ]
+    if not ranges:
+        return pages
+
+    with ThreadPoolExecutor(max_workers=PDF_EXTRACT_PROCESSES) as pool:
+        rest = pool.map(lambda r: _run_child(path, *r, deadline)[1], ranges)
+        for chunk in rest:
+            pages.extend(chunk)
+    return pages
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1:])
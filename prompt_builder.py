@@ -0,0 +1,117 @@
+import hashlib
+import threading
+from datetime import datetime
+from database import db_connection
+from config import (
+    PROMPT_CONTEXT_TOKENS,
+    PROMPT_HISTORY_TOKENS,
+    PROMPT_HISTORY_ITEM_WORDS
+)
+
+# Keeps question prompts inside a token budget. A resume or job description
+# longer than PROMPT_CONTEXT_TOKENS is summarized once (by interview_engine)
+# and the summary is stored in prompt_summaries keyed by content hash, so
+# every later question of the interview reuses it. The asked-questions
+# history is compressed to PROMPT_HISTORY_TOKENS.
+#
+# Tokens are estimated at ~4 characters each; close enough for budgeting
+# without a tokenizer round-trip.
+
+# Part of the summary key: bump when the summary prompt changes
+SUMMARY_VERSION = 1
+
+_lock = threading.Lock()
+_stats = {}  # template -> counters, see record_call()
+
+
+def estimate_tokens(text) -> int:
+    return (len(text or "") + 3) // 4
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    text = text or ""
+    if estimate_tokens(text) <= budget:
+        return text
+    # Cut on a word boundary
+    return text[:budget * 4].rsplit(" ", 1)[0] + " ..."
+
+
+def over_budget(text) -> bool:
+    return estimate_tokens(text) > PROMPT_CONTEXT_TOKENS
+
+
+def compress_history(asked_questions):
+    """Newest questions verbatim, older ones shortened, oldest dropped."""
+    if sum(estimate_tokens(q) for q in asked_questions) <= PROMPT_HISTORY_TOKENS:
+        return list(asked_questions)
+
+    kept = []
+    used = 0
+    for i, question in enumerate(reversed(asked_questions)):
+        if i >= 2:
+            words = question.split()
+            if len(words) > PROMPT_HISTORY_ITEM_WORDS:
+                question = " ".join(words[:PROMPT_HISTORY_ITEM_WORDS]) + " ..."
+        cost = estimate_tokens(question)
+        if kept and used + cost > PROMPT_HISTORY_TOKENS:
+            break
+        kept.append(question)
+        used += cost
+    return kept[::-1]
+
+# ---------------- SUMMARY STORE ----------------
+
+def summary_key(kind: str, text: str) -> str:
+    payload = f"{kind}:{SUMMARY_VERSION}:{PROMPT_CONTEXT_TOKENS}:{text}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_summary(key: str):
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT summary FROM prompt_summaries WHERE key = ?", (key,)
+        ).fetchone()
+    return row["summary"] if row else None
+
+
+def save_summary(key: str, summary: str):
+    with db_connection() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO prompt_summaries (key, summary, created_at)
+            VALUES (?, ?, ?)
+            """,
+            (key, summary, datetime.utcnow().isoformat())
+        )
+        conn.commit()
+
+# ---------------- STATS ----------------
+
+def record_call(template: str, prompt_tokens: int, raw_tokens: int, seconds: float):
+    """raw_tokens: what the prompt would have been without the budget."""
+    with _lock:
+        s = _stats.setdefault(template, {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "raw_tokens": 0,
+            "seconds": 0.0,
+            "max_seconds": 0.0
+        })
+        s["calls"] += 1
+        s["prompt_tokens"] += prompt_tokens
+        s["raw_tokens"] += raw_tokens
+        s["seconds"] += seconds
+        s["max_seconds"] = max(s["max_seconds"], seconds)
+
+
+def prompt_stats() -> dict:
+    with _lock:
+        return {
+            template: {
+                **s,
+                "avg_prompt_tokens": round(s["prompt_tokens"] / s["calls"]),
+                "tokens_saved": s["raw_tokens"] - s["prompt_tokens"],
+                "avg_seconds": round(s["seconds"] / s["calls"], 4)
+            }
+            for template, s in _stats.items()
+        }
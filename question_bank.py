@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import logging
+import random
+import re
+from datetime import datetime
+from database import db_connection, init_db
+from config import QUESTION_BANK_POOL_SIZE, QUESTION_BANK_RELOAD_SECONDS
+
+# Pre-generated interview questions per normalized job title. Interviews
+# with only a job title (no resume, no job description) are served from
+# here instead of a live LLM call; everything else still goes to the model.
+#
+# Fill it offline:   python question_bank.py [--titles ...] [--per-title N]
+#
+# Each process serves from an in-memory index of the table, which it
+# re-reads when the table changes (checked every QUESTION_BANK_RELOAD_SECONDS),
+# so questions added offline are picked up without a restart.
+
+# Roles most of our traffic asks for
+DEFAULT_JOB_TITLES = [
+    "Python Developer", "Java Developer", "JavaScript Developer",
+    "Frontend Developer", "Backend Developer", "Full Stack Developer",
+    "React Developer", "Node.js Developer", "Android Developer",
+    "iOS Developer", "Flutter Developer", "Go Developer", "C++ Developer",
+    ".NET Developer", "PHP Developer", "Ruby on Rails Developer",
+    "Software Engineer", "Software Engineer in Test", "QA Engineer",
+    "Automation Tester", "DevOps Engineer", "Site Reliability Engineer",
+    "Cloud Engineer", "AWS Engineer", "Azure Engineer", "Data Analyst",
+    "Data Scientist", "Data Engineer", "Machine Learning Engineer",
+    "AI Engineer", "NLP Engineer", "Computer Vision Engineer",
+    "Business Analyst", "Business Intelligence Analyst", "Database Administrator",
+    "SQL Developer", "Cybersecurity Analyst", "Network Engineer",
+    "System Administrator", "Embedded Systems Engineer", "Game Developer",
+    "UI/UX Designer", "Product Manager", "Project Manager", "Scrum Master",
+    "Technical Support Engineer", "Salesforce Developer", "SAP Consultant",
+    "Blockchain Developer", "Mobile App Developer",
+]
+
+# Last resort while the model is unavailable and the role has no pool
+GENERIC_QUESTIONS = [
+    "Walk me through a recent project you are proud of and your role in it.",
+    "Tell me about a difficult technical problem you solved. How did you approach it?",
+    "Describe a time you disagreed with a teammate. How did you resolve it?",
+    "How do you make sure the work you ship is correct and maintainable?",
+    "Tell me about a mistake you made at work and what you learned from it.",
+    "How do you keep your skills up to date in this field?",
+    "Describe a situation where you had to learn something new quickly.",
+    "How do you prioritize when you have several deadlines at once?",
+]
+
+_SENIORITY = {
+    "senior", "sr", "junior", "jr", "lead", "principal", "staff",
+    "intern", "trainee", "associate", "entry", "level", "i", "ii", "iii",
+}
+
+logger = logging.getLogger(__name__)
+
+_index = {}  # job_key -> [question, ...]
+_version = None  # (row count, max id) of the table _index was read from
+_reloader = None
+
+
+def normalize_job_title(job_title: str) -> str:
+    """'Sr. Python Developer (Remote)' -> 'python developer'"""
+    title = re.sub(r"\(.*?\)", " ", (job_title or "").lower())
+    words = re.sub(r"[^a-z0-9+#.]+", " ", title).split()
+    words = [w.strip(".") for w in words]
+    return " ".join(w for w in words if w and w not in _SENIORITY)
+
+
+def _table_version(conn):
+    return tuple(conn.execute(
+        "SELECT COUNT(*), MAX(id) FROM question_bank"
+    ).fetchone())
+
+
+def load_index():
+    global _index, _version
+    with db_connection() as conn:
+        version = _table_version(conn)
+        rows = conn.execute(
+            "SELECT job_key, question FROM question_bank ORDER BY id"
+        ).fetchall()
+
+    index = {}
+    for row in rows:
+        index.setdefault(row["job_key"], []).append(row["question"])
+    # Swapped in whole: readers never see a half-built index
+    _index, _version = index, version
+
+
+def refresh_index() -> bool:
+    """Reload the index if the table changed since it was read."""
+    with db_connection() as conn:
+        if _table_version(conn) == _version:
+            return False
+    load_index()
+    return True
+
+
+async def _reload_loop():
+    while True:
+        await asyncio.sleep(QUESTION_BANK_RELOAD_SECONDS)
+        try:
+            if await asyncio.to_thread(refresh_index):
+                logger.info("Question bank reloaded")
+        except Exception:
+            logger.exception("Reloading the question bank failed")
+
+
+def start_reloading():
+    global _reloader
+    if QUESTION_BANK_RELOAD_SECONDS > 0:
+        _reloader = asyncio.create_task(_reload_loop())
+
+
+def stop_reloading():
+    global _reloader
+    if _reloader is not None:
+        _reloader.cancel()
+        _reloader = None
+
+
+def pick_question(job_title: str, asked_questions) -> str:
+    """A random not-yet-asked question for the role, or None."""
+    pool = _index.get(normalize_job_title(job_title))
+    if not pool:
+        return None
+
+    asked = set(asked_questions)
+    fresh = [q for q in pool if q not in asked]
+    return random.choice(fresh) if fresh else None
+
+
+def fallback_question(job_title: str, asked_questions) -> str:
+    """Any unasked question: the role's pool first, then the generic list."""
+    question = pick_question(job_title, asked_questions)
+    if question:
+        return question
+
+    asked = set(asked_questions)
+    fresh = [q for q in GENERIC_QUESTIONS if q not in asked]
+    return random.choice(fresh) if fresh else None
+
+
+def store_questions(job_title: str, questions):
+    job_key = normalize_job_title(job_title)
+    with db_connection() as conn:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO question_bank (job_key, job_title, question, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (job_key, job_title, q, datetime.utcnow().isoformat())
+                for q in questions
+            ]
+        )
+        conn.commit()
+
+    pool = _index.setdefault(job_key, [])
+    pool.extend(q for q in questions if q not in pool)
+
+
+def pool_size(job_title: str) -> int:
+    return len(_index.get(normalize_job_title(job_title), []))
+
+
+async def seed_bank(job_titles=DEFAULT_JOB_TITLES, per_title=QUESTION_BANK_POOL_SIZE):
+    """Top up every role's pool to per_title questions."""
+    # Imported here: interview_engine itself reads from this module
+    from interview_engine import generate_question_pool_async
+
+    if not _index:
+        load_index()
+
+    for job_title in job_titles:
+        missing = per_title - pool_size(job_title)
+        if missing <= 0:
+            continue
+        try:
+            questions = await generate_question_pool_async(job_title, missing)
+        except Exception:
+            logger.exception("Could not generate questions for %s", job_title)
+            continue
+        store_questions(job_title, questions)
+        logger.info("%s: +%d questions", job_title, len(questions))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate interview questions")
+    parser.add_argument("--titles", nargs="*", default=DEFAULT_JOB_TITLES)
+    parser.add_argument("--per-title", type=int, default=QUESTION_BANK_POOL_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    asyncio.run(seed_bank(args.titles, args.per_title))
@@ -1,9 +1,55 @@
-from PyPDF2 import PdfReader
+import hashlib
+from functools import lru_cache
+from database import db_connection
+from config import RESUME_TEXT_CACHE_SIZE
+from pdf_extract import extract_pages
 
 
 def extract_text_from_pdf(path):
-    reader = PdfReader(path)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text
+    # Sandboxed, page-capped and time-bounded; see pdf_extract.py
+    return "".join(extract_pages(path))
+
+
+# ---------------- PARSED TEXT CACHE ----------------
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_resume_text(path, resume_hash: str = None) -> str:
+    """Parse the resume once and store its text keyed by content hash."""
+    resume_hash = resume_hash or file_hash(path)
+
+    with db_connection() as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM resume_texts WHERE hash = ?", (resume_hash,)
+        ).fetchone()
+
+    if not exists:
+        # Parse outside the connection so the pool slot isn't held meanwhile
+        text = extract_text_from_pdf(path)
+        with db_connection() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO resume_texts (hash, text) VALUES (?, ?)",
+                (resume_hash, text)
+            )
+            conn.commit()
+
+    return resume_hash
+
+
+@lru_cache(maxsize=RESUME_TEXT_CACHE_SIZE)
+def get_resume_text(resume_hash: str) -> str:
+    # Misses raise instead of returning None so they are never memoized
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT text FROM resume_texts WHERE hash = ?", (resume_hash,)
+        ).fetchone()
+
+    if row is None:
+        raise KeyError(resume_hash)
+    return row["text"]
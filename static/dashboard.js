@@ -50,6 +50,34 @@ async function loadHistory() {
     }
 }
 
+// 📊 Load score stats
+async function loadStats() {
+    try {
+        const res = await fetch(`${API_BASE}/my-stats`, {
+            headers: {
+                "Authorization": `Bearer ${token}`
+            }
+        });
+
+        if (!res.ok) return;
+
+        const stats = await res.json();
+        const show = (id, value) => {
+            const el = document.getElementById(id);
+            if (el) el.innerText = value ?? "-";
+        };
+
+        show("stat-count", stats.interview_count);
+        show("stat-average", stats.average_score);
+        show("stat-best", stats.best_score);
+        show("stat-trend", stats.trend === null ? null
+            : `${stats.trend > 0 ? "+" : ""}${stats.trend}`);
+
+    } catch (err) {
+        console.error(err);
+    }
+}
+
 // 👤 Load logged-in user name
 async function loadUserName() {
     try {
@@ -77,4 +105,5 @@ async function loadUserName() {
 window.onload = () => {
     loadUserName();
     loadHistory();
+    loadStats();
 };
@@ -62,28 +62,87 @@ function speak(text) {
     speechSynthesis.speak(speech);
 }
 
+// ---------------- SERVER-SENT EVENTS ----------------
+// EventSource cannot send the Authorization header, so read the
+// text/event-stream body from fetch() and split it into events here.
+async function readEvents(res, onEvent) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = "message";
+            let data = "";
+            raw.split("\n").forEach(line => {
+                if (line.startsWith("event: ")) event = line.slice(7);
+                if (line.startsWith("data: ")) data += line.slice(6);
+            });
+
+            onEvent(event, data ? JSON.parse(data) : {});
+        }
+    }
+}
+
 // ---------------- LOAD QUESTION ----------------
 async function loadQuestion() {
     const loading = document.getElementById("loading");
     if (loading) loading.style.display = "block";
 
     const res = await fetch(
-        `${API_BASE}/next-question?interview_id=${interviewId}`,
+        `${API_BASE}/next-question/stream?interview_id=${interviewId}`,
         { headers: { "Authorization": `Bearer ${token}` } }
     );
 
-    const data = await res.json();
+    const questionEl = document.getElementById("question");
+    let streamed = "";
+    let spoken = 0;
 
-    if (data.end) {
-        window.location.href = `/result?interview_id=${interviewId}`;
-        return;
-    }
+    await readEvents(res, (event, data) => {
+        if (event === "end") {
+            window.location.href = `/result?interview_id=${interviewId}`;
+            return;
+        }
 
-    currentQuestion = data.question;
-    document.getElementById("question").innerText =
-        `Question ${data.question_number}: ${currentQuestion}`;
+        if (event === "token") {
+            if (loading) loading.style.display = "none";
+            streamed += data.text;
+            questionEl.innerText = streamed;
+
+            // Speak each finished sentence without waiting for the rest
+            const lastStop = Math.max(
+                streamed.lastIndexOf(". "),
+                streamed.lastIndexOf("? ")
+            );
+            if (lastStop + 1 > spoken) {
+                speak(streamed.slice(spoken, lastStop + 1));
+                spoken = lastStop + 1;
+            }
+        }
+
+        if (event === "question") {
+            currentQuestion = data.question;
+            questionEl.innerText =
+                `Question ${data.question_number}: ${currentQuestion}`;
+
+            if (spoken < currentQuestion.length) {
+                speak(currentQuestion.slice(spoken));
+            }
+        }
 
-    speak(currentQuestion);
+        if (event === "error") {
+            questionEl.innerText = data.detail;
+        }
+    });
 
     if (loading) loading.style.display = "none";
 }
@@ -130,9 +189,6 @@ async function submitAnswer() {
     const answer = document.getElementById("answer").value.trim();
     if (!answer) return;
 
-    const loading = document.getElementById("loading");
-    if (loading) loading.style.display = "block";
-
     const res = await fetch(`${API_BASE}/submit-answer`, {
         method: "POST",
         headers: {
@@ -148,12 +204,45 @@ async function submitAnswer() {
 
     const data = await res.json();
 
-    document.getElementById("feedback").innerText =
-        `Score: ${data.score}/10 | ${data.feedback}`;
-
+    // Scoring happens in the background; move on straight away
     document.getElementById("answer").value = "";
 
-    setTimeout(loadQuestion, 2000);
+    if (data.status === "deferred") {
+        document.getElementById("feedback").innerText =
+            "Answer saved. You'll get feedback when the interview ends.";
+    } else {
+        document.getElementById("feedback").innerText =
+            "Answer saved. Feedback will appear here shortly.";
+        pollFeedback(data.question_id);
+    }
+
+    loadQuestion();
+}
+
+// ---------------- BACKGROUND FEEDBACK ----------------
+async function pollFeedback(questionId) {
+    for (let attempt = 0; attempt < 60; attempt++) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+
+        const res = await fetch(
+            `${API_BASE}/answer-status?question_id=${questionId}`,
+            { headers: { "Authorization": `Bearer ${token}` } }
+        );
+        if (!res.ok) return;
+
+        const data = await res.json();
+
+        if (data.status === "done") {
+            document.getElementById("feedback").innerText =
+                `Previous answer: ${data.score}/10 | ${data.feedback}`;
+            return;
+        }
+
+        if (data.status === "failed") {
+            document.getElementById("feedback").innerText = data.feedback;
+            return;
+        }
+    }
 }
 
 // ---------------- SKIP QUESTION ----------------
@@ -20,6 +20,9 @@ async function submitSetup() {
     if (jobTitle) formData.append("job_title", jobTitle);
     if (jobDesc) formData.append("job_description", jobDesc);
     if (resume) formData.append("resume", resume);
+    if (document.getElementById("deferred_scoring").checked) {
+        formData.append("deferred_scoring", "true");
+    }
 
     const res = await fetch(`${API_BASE}/start-interview`, {
         method: "POST",
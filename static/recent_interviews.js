@@ -4,8 +4,16 @@ if (!token) {
     window.location.href = "/login";
 }
 
-async function loadRecentInterviews() {
-    const res = await fetch("http://localhost:8000/my-interviews", {
+// Cursor for the next page, from the X-Next-Cursor header
+let nextCursor = null;
+
+async function loadRecentInterviews(append = false) {
+    const url = new URL("http://localhost:8000/my-interviews");
+    if (append && nextCursor) {
+        url.searchParams.set("cursor", nextCursor);
+    }
+
+    const res = await fetch(url, {
         headers: {
             Authorization: `Bearer ${token}`
         }
@@ -13,16 +21,18 @@ async function loadRecentInterviews() {
 
     const data = await res.json();
     const tableBody = document.getElementById("recent-body");
+    nextCursor = res.headers.get("X-Next-Cursor");
 
-    tableBody.innerHTML = "";
+    if (!append) {
+        tableBody.innerHTML = "";
+    }
 
-    if (data.length === 0) {
+    if (!append && data.length === 0) {
         tableBody.innerHTML = `
             <tr>
                 <td colspan="4">No interviews conducted yet</td>
             </tr>
         `;
-        return;
     }
 
     data.forEach(interview => {
@@ -39,6 +49,22 @@ async function loadRecentInterviews() {
 
         tableBody.appendChild(tr);
     });
+
+    updateLoadMore(tableBody);
+}
+
+function updateLoadMore(tableBody) {
+    let button = document.getElementById("recent-more");
+
+    if (!button) {
+        button = document.createElement("button");
+        button.id = "recent-more";
+        button.innerText = "Load more";
+        button.onclick = () => loadRecentInterviews(true);
+        tableBody.closest("table").after(button);
+    }
+
+    button.style.display = nextCursor ? "" : "none";
 }
 
-window.onload = loadRecentInterviews;
+window.onload = () => loadRecentInterviews();
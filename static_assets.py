@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from config import ASSET_CACHE_ENABLED, ASSET_COMPRESS_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # Optional; without it only gzip is offered
+    brotli = None
+
+# Pages and static files are built once per process and served from memory:
+#
+#   - every file under static/ is hashed, and reachable both by its own name
+#     and by a fingerprinted one (dashboard.css -> dashboard.<hash>.css)
+#     that is cached by browsers forever, since its content can't change
+#   - text-like files are gzip (and brotli) compressed up front
+#   - templates take no context, so each page is rendered once, with its
+#     /static links rewritten to the fingerprinted names
+#
+# Everything carries an ETag, so a revalidated page costs a 304.
+# ASSET_CACHE_ENABLED=0 turns it all off while editing templates/assets.
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE = {".css", ".js", ".pdf", ".svg", ".ico", ".html", ".txt", ".json"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# href="/static/x.css", src="static/x.js"
+_STATIC_LINK = re.compile(r"""((?:src|href)=["'])/?static/([^"'?#]+)""")
+
+
+def _accepted_encodings(headers) -> set:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").split(","):
+        token, _, params = part.partition(";")
+        _, _, q = params.partition("q=")
+        try:
+            if q and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+class Asset:
+    """One response body, its compressed variants and their ETags."""
+
+    def __init__(self, body: bytes, media_type: str, compress: bool = True):
+        self.media_type = media_type
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.variants = {None: body}
+
+        if compress and len(body) >= ASSET_COMPRESS_MIN_BYTES:
+            encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=11)
+            for encoding, data in encoded.items():
+                # Already-compressed content (most PDFs) may not shrink
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+
+    def response(self, request_headers, cache_control: str) -> Response:
+        accepted = _accepted_encodings(request_headers)
+        encoding = next(
+            (e for e in ("br", "gzip") if e in self.variants and e in accepted),
+            None
+        )
+        # Each encoding is a different representation, so its own tag
+        etag = f'"{self.digest[:32]}{"-" + encoding if encoding else ""}"'
+
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+
+        client_tags = request_headers.get("if-none-match", "").split(",")
+        if etag in (t.strip().removeprefix("W/") for t in client_tags):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+
+
+def _fingerprint(name: str, digest: str) -> str:
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest[:12]}"
+    return f"{stem}.{digest[:12]}.{suffix}"
+
+
+# ---------------- STATIC FILES ----------------
+
+class StaticAssets:
+    """ASGI app for /static serving files from memory (see top of file)."""
+
+    def __init__(self, directory, mount_path: str = "/static"):
+        self.fallback = StaticFiles(directory=directory)
+        self.files = {}  # path under the mount -> (Asset, Cache-Control)
+        self.urls = {}   # file name -> fingerprinted URL
+
+        if not ASSET_CACHE_ENABLED:
+            return
+
+        root = Path(directory)
+        for path in sorted(root.rglob("*")):
+            if not path.is_file():
+                continue
+            name = path.relative_to(root).as_posix()
+            asset = Asset(
+                path.read_bytes(),
+                mimetypes.guess_type(name)[0] or "application/octet-stream",
+                compress=path.suffix.lower() in COMPRESSIBLE
+            )
+            hashed = _fingerprint(name, asset.digest)
+            self.files[name] = (asset, REVALIDATE)
+            self.files[hashed] = (asset, IMMUTABLE)
+            self.urls[name] = f"{mount_path}/{hashed}"
+
+        logger.info("Loaded %d static files", len(self.urls))
+
+    def rewrite_links(self, html: str) -> str:
+        def replace(match):
+            url = self.urls.get(match.group(2))
+            return match.group(1) + url if url else match.group(0)
+        return _STATIC_LINK.sub(replace, html)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET":
+            # Mount puts its own prefix in root_path
+            path = scope["path"].removeprefix(scope.get("root_path", "")).lstrip("/")
+            entry = self.files.get(path)
+            if entry:
+                asset, cache_control = entry
+                response = asset.response(Headers(scope=scope), cache_control)
+                await response(scope, receive, send)
+                return
+
+        # Files added after startup, HEAD requests, and the disabled mode
+        await self.fallback(scope, receive, send)
+
+# ---------------- PAGES ----------------
+
+class PageCache:
+    """Rendered, link-rewritten and compressed templates, built on first use."""
+
+    def __init__(self, templates, assets: StaticAssets):
+        self.templates = templates
+        self.assets = assets
+        self._pages = {}
+
+    def render(self, request, name: str) -> Response:
+        if not ASSET_CACHE_ENABLED:
+            return self.templates.TemplateResponse(request, name)
+
+        page = self._pages.get(name)
+        if page is None:
+            # Page templates take no context
+            html = self.templates.get_template(name).render()
+            page = self._pages[name] = Asset(
+                self.assets.rewrite_links(html).encode(), "text/html; charset=utf-8"
+            )
+        return page.response(request.headers, REVALIDATE)
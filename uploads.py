@@ -0,0 +1,193 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from config import MAX_RESUME_BYTES, MAX_BATCH_UPLOAD_BYTES, UPLOAD_CHUNK_BYTES
+
+RESUMES_DIR = Path("resumes")
+
+# Room for multipart boundaries and the form's other fields
+_FORM_OVERHEAD_BYTES = 1024 * 1024
+
+
+def save_resume(upload: UploadFile):
+    """
+    Stream an uploaded resume to resumes/<sha256>.pdf in fixed-size chunks,
+    hashing as it goes. Identical files share one copy on disk.
+    Returns (path, sha256 hex digest).
+    """
+    return save_resume_file(upload.file)
+
+
+def hash_upload(upload: UploadFile) -> str:
+    """sha256 of an upload without saving it; rewinds it for save_resume()."""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := upload.file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > MAX_RESUME_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Resume is larger than {MAX_RESUME_BYTES // (1024 * 1024)} MB"
+            )
+        digest.update(chunk)
+    upload.file.seek(0)
+    return digest.hexdigest()
+
+
+def save_resume_file(source):
+    """save_resume() for any readable binary file object."""
+    RESUMES_DIR.mkdir(exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=RESUMES_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_RESUME_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Resume is larger than {MAX_RESUME_BYTES // (1024 * 1024)} MB"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        resume_hash = digest.hexdigest()
+        path = RESUMES_DIR / f"{resume_hash}.pdf"
+
+        if path.exists():
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path, resume_hash
+
+# ---------------- BATCH UPLOADS ----------------
+
+def is_zip(upload: UploadFile) -> bool:
+    return (upload.filename or "").lower().endswith(".zip") or upload.content_type in (
+        "application/zip", "application/x-zip-compressed"
+    )
+
+
+def save_batch_zip(upload: UploadFile) -> Path:
+    """Copy an uploaded zip of resumes to a temp file the caller removes."""
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := upload.file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_BATCH_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Archive is larger than {MAX_BATCH_UPLOAD_BYTES // (1024 * 1024)} MB"
+                    )
+                out.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return Path(tmp_path)
+
+
+def _pdf_members(archive):
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and info.filename.lower().endswith(".pdf")
+    ]
+
+
+def count_zip_resumes(zip_path) -> int:
+    """How many results iter_zip_resumes() will yield; reads only the index."""
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            return len(_pdf_members(archive))
+    except zipfile.BadZipFile:
+        return 1
+
+
+def iter_zip_resumes(zip_path):
+    """
+    Save each PDF in the archive like save_resume(), one at a time.
+    Yields (name, path, error); a bad member doesn't stop the rest, and an
+    unreadable archive yields a single error with name None.
+    """
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        yield None, None, "Not a valid zip archive"
+        return
+
+    with archive:
+        for info in _pdf_members(archive):
+            name = info.filename
+            # Checked before inflating anything; save_resume_file still
+            # enforces the limit on the bytes actually read
+            if info.file_size > MAX_RESUME_BYTES:
+                yield name, None, "Resume is too large"
+                continue
+            try:
+                with archive.open(info) as member:
+                    path, _ = save_resume_file(member)
+            except HTTPException as exc:
+                yield name, None, exc.detail
+            except (zipfile.BadZipFile, RuntimeError, OSError, EOFError):
+                yield name, None, "Could not extract this file"
+            else:
+                yield name, path, None
+
+# ---------------- REQUEST SIZE ----------------
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware capping request bodies per path (default for the rest).
+    A declared Content-Length over the limit gets 413 without reading the
+    body; a chunked body is cut off with 413 once it passes the limit, so
+    an oversized upload is never spooled to disk in full.
+    """
+
+    def __init__(self, app, default: int, limits: dict = None):
+        self.app = app
+        self.default = default
+        self.limits = limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        allowed = self.limits.get(scope["path"], self.default)
+        limit = allowed + _FORM_OVERHEAD_BYTES
+        detail = f"Upload is larger than {allowed // (1024 * 1024)} MB"
+
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > limit:
+            response = JSONResponse({"detail": detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parser, which lets it through
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
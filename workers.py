@@ -0,0 +1,145 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from config import PARSE_WORKERS, PARSE_TIMEOUT_SECONDS, MAX_CONCURRENT_PARSES
+
+# PyPDF2 parsing is pure-Python CPU work that holds the GIL, so threads
+# don't help; it runs in worker processes instead. "spawn" avoids forking
+# a process that already has the event loop and thread pools running.
+#
+# Each worker process runs one job at a time over its own pipe. A job's
+# timeout starts when a worker picks it up, not while it waits for one,
+# and a job that overruns (or whose caller goes away) costs only its own
+# worker, which is killed and replaced; other callers' jobs carry on.
+# ProcessPoolExecutor can't do either: it has no per-job start signal,
+# and losing any worker breaks every pending future.
+
+_context = multiprocessing.get_context("spawn")
+_idle = None          # asyncio.Queue of _Worker, or None for "start one"
+_workers = set()
+_parse_slots = None
+
+# Threads blocked in Connection.recv(), one per running job
+_waiters = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse-wait")
+
+
+def _worker_main(conn):
+    conn.send(("ready", None))
+    while True:
+        try:
+            fn, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = ("ok", fn(*args))
+        except Exception as exc:
+            reply = ("error", exc)
+        try:
+            conn.send(reply)
+        except Exception as exc:
+            # Result or exception that doesn't pickle; nothing was written
+            conn.send(("error", RuntimeError(repr(exc))))
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child_conn = _context.Pipe()
+        self.process = _context.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        _workers.add(self)
+
+    def kill(self, reply=None):
+        _workers.discard(self)
+        self.process.kill()
+        if reply is None:
+            self.conn.close()
+        else:
+            # The waiting thread gets EOF once the process is gone
+            reply.add_done_callback(lambda f: (f.exception(), self.conn.close()))
+        self.process.join(timeout=0)
+
+
+async def _start_worker():
+    # Process start-up and imports don't count against a job's timeout
+    worker = _Worker()
+    try:
+        await asyncio.get_running_loop().run_in_executor(_waiters, worker.conn.recv)
+    except BaseException:
+        worker.kill()
+        raise
+    return worker
+
+
+def _get_idle():
+    global _idle
+    if _idle is None:
+        _idle = asyncio.Queue()
+        for _ in range(PARSE_WORKERS):
+            _idle.put_nowait(None)
+    return _idle
+
+
+def _get_parse_slots():
+    global _parse_slots
+    if _parse_slots is None:
+        _parse_slots = asyncio.Semaphore(MAX_CONCURRENT_PARSES)
+    return _parse_slots
+
+
+async def run_cpu_job(fn, *args, timeout: float = PARSE_TIMEOUT_SECONDS):
+    """Run fn(*args) in a parse worker without blocking the event loop."""
+    async with _get_parse_slots():
+        idle = _get_idle()
+        worker = await idle.get()
+        reply = None
+        try:
+            if worker is None:
+                worker = await _start_worker()
+            worker.conn.send((fn, args))
+            reply = asyncio.get_running_loop().run_in_executor(_waiters, worker.conn.recv)
+            status, value = await asyncio.wait_for(asyncio.shield(reply), timeout=timeout)
+        except TimeoutError:
+            worker.kill(reply)
+            worker = None
+            raise HTTPException(
+                status_code=422,
+                detail="Resume took too long to process"
+            )
+        except (EOFError, OSError):
+            # The worker died mid-job or at start-up (crash, OOM kill)
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise HTTPException(
+                status_code=422,
+                detail="Resume could not be processed"
+            )
+        except BaseException:
+            # Caller cancelled: the job may still be running, so its worker
+            # can't be handed to anyone else
+            if reply is not None:
+                worker.kill(reply)
+                worker = None
+            raise
+        finally:
+            idle.put_nowait(worker)
+
+    if status == "error":
+        raise value
+    return value
+
+
+def parse_slots() -> dict:
+    free = _parse_slots._value if _parse_slots else MAX_CONCURRENT_PARSES
+    return {"in_use": MAX_CONCURRENT_PARSES - free, "capacity": MAX_CONCURRENT_PARSES}
+
+
+def shutdown_workers():
+    global _idle
+    for worker in list(_workers):
+        worker.kill()
+    _idle = None